@@ -1,6 +1,8 @@
 from manimlib import *
 import numpy as np
 
+from mutable_geometry import MutableArrow, MutableCircle
+
 class SinThetaLimit(InteractiveScene):
     def construct(self):
         r = 1  # Fixed radius
@@ -18,14 +20,14 @@ class SinThetaLimit(InteractiveScene):
         # Circle for reference
         radius = r / theta()  # start with theta=0.3
 
-        circle = Circle(radius=radius, stroke_color=circle_color)
-        vector = Arrow(ORIGIN, get_vector(theta()), buff=0, stroke_color=vector_color)
+        circle = MutableCircle(radius=radius, stroke_color=circle_color)
+        vector = MutableArrow(ORIGIN, get_vector(theta()), buff=0, stroke_color=vector_color, fill_color=vector_color)
 
         self.play(ShowCreation(circle))
         self.play(GrowArrow(vector))
 
-        circle.add_updater(lambda c: c.become(Circle(radius=r/theta(), stroke_color=circle_color)))
-        vector.add_updater(lambda a: a.become(Arrow(ORIGIN, get_vector(theta()), buff=0, fill_color=vector_color, stroke_width=min(3, 1/theta()))))
+        circle.add_updater(lambda c: c.set_radius(r/theta()))
+        vector.add_updater(lambda a: a.put_start_and_end_on(ORIGIN, get_vector(theta())).set_stroke(width=min(3, 1/theta())))
 
         # Trace path of tip of the vector
         dot = always_redraw(lambda: Dot(get_vector(theta_tracker.get_value()), color=RED))
@@ -0,0 +1,382 @@
+from manimlib import *
+from functools import lru_cache
+import numpy as np
+
+from level_of_detail import choose_tiers, get_pixels_per_unit
+
+
+# 3D arrows drawn from one shared unit mesh. The shaft (an open cylinder) and
+# the tip (a cone) are built once per resolution, and each arrow only carries
+# a transform: its start, unit direction and length, plus a color. A field of
+# N arrows is a single Surface whose vertex buffer holds N transformed copies
+# of the unit mesh, rewritten in place from (N, 3) arrays. Moves made with the
+# usual Mobject methods (shift, rotate, scale, directly or through a parent)
+# are read back from a few vertices before the next rewrite and folded into
+# the starts and directions, so they stick.
+
+
+@lru_cache
+def get_unit_arrow_mesh(resolution=(24, 2)):
+    # Unit shaft (radius 1, z from 0 to 1) followed by unit tip (base radius 1
+    # at z = 0, apex at z = 1). Both are ruled surfaces, so two rows along the
+    # axis give the same picture as more. Returns point, du_point and dv_point
+    # stacked as (3, vertices, 3), a per-vertex is_tip mask and the triangle
+    # indices of one arrow.
+    shaft = Cylinder(radius=1, height=1, resolution=resolution)
+    shaft.shift(0.5*OUT)
+    tip = Cone(radius=1, height=1, resolution=resolution)
+
+    points = np.array([
+        np.vstack([shaft.data[key], tip.data[key]])
+        for key in Surface.pointlike_data_keys
+    ], dtype=float)
+    is_tip = np.zeros(points.shape[1], dtype=bool)
+    is_tip[shaft.get_num_points():] = True
+    triangle_indices = np.hstack([
+        shaft.get_triangle_indices(),
+        tip.get_triangle_indices() + shaft.get_num_points(),
+    ])
+    for array in (points, is_tip, triangle_indices):
+        array.setflags(write=False)
+    return points, is_tip, triangle_indices
+
+
+def get_arrow_frames(directions):
+    # Lengths and orthonormal frames (e1, e2, unit direction) for each row of
+    # an (N, 3) array: the rotation taking OUT to the direction about their
+    # common normal, as rotating a single arrow into place would
+    lengths = np.linalg.norm(directions, axis=1)
+    units = np.array(OUT, dtype=float)*np.ones_like(directions)
+    nonzero = lengths > 1e-8
+    units[nonzero] = directions[nonzero]/lengths[nonzero, np.newaxis]
+    ux, uy, uz = units.T
+
+    # Rodrigues' formula, which breaks down for a direction of -OUT
+    flipped = uz < -1 + 1e-9
+    scale = 1/np.where(flipped, 1, 1 + uz)
+    e1 = np.array([1 - ux*ux*scale, -ux*uy*scale, -ux]).T
+    e2 = np.array([-ux*uy*scale, 1 - uy*uy*scale, -uy]).T
+    e1[flipped] = RIGHT
+    e2[flipped] = DOWN
+    return lengths, e1, e2, units
+
+
+ARROW_RESOLUTIONS = ((24, 2), (12, 2), (6, 2))
+
+
+class Arrow3DField(Surface):
+    # Each arrow is drawn at one of a few resolution tiers, finest first.
+    # All start on the finest; update_level_of_detail picks each arrow's tier
+    # from its size on screen (see level_of_detail.py).
+    def __init__(
+        self,
+        starts,
+        directions,
+        colors=WHITE,
+        opacity : float = 1.0,
+        shaft_radius : float = 0.03,
+        tip_length : float = 0.3,
+        tip_radius : float = 0.1,
+        buff : float = 0,
+        resolutions=ARROW_RESOLUTIONS,
+        **kwargs
+    ):
+        self.directions = np.array(directions, dtype=float).reshape(-1, 3)
+        self.starts = np.array(starts, dtype=float) * np.ones_like(self.directions)
+        self.n_arrows = len(self.directions)
+        self.shaft_radius = shaft_radius
+        self.tip_length = tip_length
+        self.tip_radius = tip_radius
+        self.buff = buff
+        self.written_samples = None
+
+        self.resolutions = [tuple(resolution) for resolution in resolutions]
+        self.refresh_tier_meshes()
+        self.set_tier_layout(np.zeros(self.n_arrows, dtype=int))
+
+        super().__init__(resolution=self.resolutions[0], **kwargs)
+        self.set_colors(colors, opacity)
+
+    def refresh_tier_meshes(self):
+        self.tier_meshes = [
+            self.get_mesh_coefficients(resolution, self.shaft_radius, self.tip_radius)
+            for resolution in self.resolutions
+        ]
+
+    def get_mesh_coefficients(self, resolution, shaft_radius, tip_radius):
+        # Unit mesh with the radii applied, as (pointlike keys, vertices, 4)
+        # coefficients of each arrow's e1, e2, shaft vector and tip vector
+        unit_points, is_tip, triangle_indices = get_unit_arrow_mesh(resolution)
+        radii = np.where(is_tip, tip_radius, shaft_radius)
+        coefficients = np.array([
+            unit_points[:, :, 0]*radii,
+            unit_points[:, :, 1]*radii,
+            np.where(is_tip, 1, unit_points[:, :, 2]),
+            np.where(is_tip, unit_points[:, :, 2], 0),
+        ]).transpose(1, 2, 0)
+        return coefficients, triangle_indices
+
+    def set_tier_layout(self, tiers):
+        # Arrows are stored grouped by tier. Each group is (tier, arrow
+        # indices, first vertex, vertices per arrow).
+        self.tiers = tiers
+        self.tier_groups = []
+        n_points = 0
+        for tier, (coefficients, triangle_indices) in enumerate(self.tier_meshes):
+            indices = np.flatnonzero(tiers == tier)
+            if len(indices) == 0:
+                continue
+            mesh_size = coefficients.shape[1]
+            self.tier_groups.append((tier, indices, n_points, mesh_size))
+            n_points += len(indices)*mesh_size
+        self.n_tier_points = n_points
+
+    def init_points(self):
+        self.set_points(np.zeros((self.n_tier_points, 3)))
+        self.refresh_arrow_points()
+
+    def compute_triangle_indices(self):
+        self.triangle_indices = np.hstack([np.zeros(0, dtype=int)] + [
+            ((first + mesh_size*np.arange(len(indices)))[:, np.newaxis] + self.tier_meshes[tier][1]).ravel()
+            for tier, indices, first, mesh_size in self.tier_groups
+        ])
+        return self.triangle_indices
+
+    def sync_placement(self):
+        # Fit the affine change between a spread of vertices as last written
+        # and as they are now, and fold it into the starts and directions
+        if self.written_samples is None:
+            return self
+        samples, written = self.written_samples
+        if self.get_num_points() <= samples[-1]:
+            return self
+        current = self.data["point"][samples].astype(float)
+        if np.array_equal(current, written):
+            return self
+        shift = (current - written).mean(0)
+        if np.allclose(current, written + shift, atol=1e-4):
+            matrix, offset = np.identity(3), shift
+        else:
+            homogeneous = np.hstack([written, np.ones((len(samples), 1))])
+            solution, _, rank, _ = np.linalg.lstsq(homogeneous, current, rcond=None)
+            if rank < 4 or not np.allclose(homogeneous @ solution, current, atol=1e-4):
+                # Not a move, such as a partial draw, so it's drawn over
+                return self
+            matrix, offset = solution[:3].T, solution[3]
+        self.written_samples = (samples, current)
+        return self.fold_transform(matrix, offset)
+
+    def fold_transform(self, matrix, offset):
+        # The arrows were moved by p -> matrix @ p + offset. Radii and the
+        # tip length follow the overall change of scale.
+        self.starts = self.starts @ matrix.T + offset
+        self.directions = self.directions @ matrix.T
+        scale = np.cbrt(abs(np.linalg.det(matrix)))
+        if not np.isclose(scale, 1) and scale > 1e-8:
+            self.shaft_radius *= scale
+            self.tip_radius *= scale
+            self.tip_length *= scale
+            self.buff *= scale
+            self.refresh_tier_meshes()
+        return self
+
+    def refresh_arrow_points(self):
+        self.sync_placement()
+        lengths, e1, e2, units = get_arrow_frames(self.directions)
+        tip_lengths = np.minimum(self.tip_length, lengths)
+        basis = np.stack([
+            e1, e2,
+            units*(lengths - tip_lengths)[:, np.newaxis],
+            units*tip_lengths[:, np.newaxis],
+        ], axis=1)
+        arrow_starts = self.starts + self.buff*units
+
+        for tier, indices, first, mesh_size in self.tier_groups:
+            # (arrows, 4, 3) bases against (keys, vertices, 4) coefficients
+            points = np.matmul(self.tier_meshes[tier][0][:, np.newaxis], basis[indices])
+            points += arrow_starts[indices, np.newaxis]
+            end = first + len(indices)*mesh_size
+            for key, key_points in zip(self.pointlike_data_keys, points):
+                self.data[key][first:end] = key_points.reshape(-1, 3)
+        n_points = self.get_num_points()
+        samples = np.linspace(0, n_points - 1, min(n_points, 64)).astype(int)
+        self.written_samples = (samples, self.data["point"][samples].astype(float))
+        self.note_changed_data()
+        self.refresh_bounding_box()
+        return self
+
+    def set_vectors(self, directions, starts=None):
+        # Bulk update from (N, 3) arrays; a single start is shared by all
+        self.sync_placement()
+        self.directions[:] = directions
+        if starts is not None:
+            self.starts[:] = starts
+        return self.refresh_arrow_points()
+
+    def put_starts_and_ends_on(self, starts, ends):
+        starts = np.asarray(starts, dtype=float)
+        return self.set_vectors(np.asarray(ends) - starts, starts)
+
+    def get_starts(self):
+        return self.sync_placement().starts.copy()
+
+    def get_directions(self):
+        return self.sync_placement().directions.copy()
+
+    def get_ends(self):
+        return self.get_starts() + self.directions
+
+    def get_arrow_rgbas(self):
+        # Color of each arrow's first vertex, so this also sees set_color
+        rgbas = np.ones((self.n_arrows, 4))
+        for tier, indices, first, mesh_size in self.tier_groups:
+            rgbas[indices] = self.data["rgba"][first:first + len(indices)*mesh_size:mesh_size]
+        return rgbas
+
+    def set_arrow_rgbas(self, rgbas):
+        for tier, indices, first, mesh_size in self.tier_groups:
+            end = first + len(indices)*mesh_size
+            self.data["rgba"][first:end] = np.repeat(rgbas[indices], mesh_size, axis=0)
+        self.note_changed_data()
+        return self
+
+    def set_colors(self, colors, opacity=None):
+        # One color for every arrow, a list of colors, or an (N, 3) or (N, 4)
+        # array of rgb(a) values
+        if opacity is None:
+            opacity = self.data["rgba"][0, 3] if len(self.data) else 1.0
+        if isinstance(colors, np.ndarray) and colors.ndim == 2:
+            rgbas = np.ones((len(colors), 4))
+            rgbas[:, 3] = opacity
+            rgbas[:, :colors.shape[1]] = colors
+        else:
+            rgbas = np.array([color_to_rgba(color, opacity) for color in listify(colors)])
+        return self.set_arrow_rgbas(rgbas*np.ones((self.n_arrows, 1)))
+
+    def set_tiers(self, tiers):
+        tiers = np.clip(np.asarray(tiers, dtype=int), 0, len(self.tier_meshes) - 1)
+        tiers = tiers*np.ones(self.n_arrows, dtype=int)
+        if np.array_equal(tiers, self.tiers):
+            return self
+        # Moves have to be read back before the buffer is laid out again
+        self.sync_placement()
+        rgbas = self.get_arrow_rgbas()
+        self.set_tier_layout(tiers)
+        self.set_points(np.zeros((self.n_tier_points, 3)))
+        self.compute_triangle_indices()
+        self.set_arrow_rgbas(rgbas)
+        return self.refresh_arrow_points()
+
+    def update_level_of_detail(self, frame, pixel_width=DEFAULT_PIXEL_WIDTH):
+        # Tier from the tip's circumference in pixels, at the arrow's middle
+        self.sync_placement()
+        midpoints = self.starts + 0.5*self.directions
+        pixels_per_unit = get_pixels_per_unit(frame, midpoints, pixel_width)
+        circumferences = TAU*self.tip_radius*pixels_per_unit
+        tier_segments = [resolution[0] - 1 for resolution in self.resolutions]
+        return self.set_tiers(choose_tiers(circumferences, tier_segments))
+
+
+class Arrow3D(Arrow3DField):
+    # A field of one arrow
+    def __init__(
+        self,
+        direction,
+        start = ORIGIN,
+        color = WHITE,
+        shaft_radius : float = 0.03,
+        tip_length : float = 0.3,
+        tip_radius : float = 0.1,
+        buff : float = 0,
+        **kwargs
+    ):
+        super().__init__(
+            start, direction,
+            colors=color,
+            shaft_radius=shaft_radius,
+            tip_length=tip_length,
+            tip_radius=tip_radius,
+            buff=buff,
+            **kwargs
+        )
+
+    @property
+    def start(self):
+        return self.get_starts()[0]
+
+    @property
+    def direction(self):
+        return self.get_directions()[0]
+
+    @property
+    def length(self):
+        return get_norm(self.direction)
+
+    @property
+    def tip(self):
+        return self.start + self.direction
+
+    def put_start_and_end_on(self, start, end):
+        return self.put_starts_and_ends_on(start, end)
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    def build_separately(starts, directions):
+        # What Arrow3D used to do: a fresh Cylinder and Cone per arrow,
+        # rotated into place
+        arrows = Group()
+        for start, direction in zip(starts, directions):
+            length = get_norm(direction)
+            shaft = Cylinder(radius=0.03, height=length - 0.3, resolution=(24, 16))
+            shaft.shift(OUT*(length - 0.3)/2)
+            tip = Cone(radius=0.1, height=0.3, resolution=(24, 16))
+            tip.shift(OUT*(length - 0.3))
+            arrow = Group(shaft, tip)
+            axis = np.cross(OUT, direction)
+            if get_norm(axis) > 1e-6:
+                arrow.rotate(angle_between_vectors(OUT, direction), axis=axis, about_point=ORIGIN)
+            arrows.add(arrow.shift(start))
+        return arrows
+
+    rng = np.random.default_rng(0)
+    for n_arrows in [10, 100, 1000, 10000]:
+        starts = rng.uniform(-3, 3, (n_arrows, 3))
+        directions = rng.normal(size=(n_arrows, 3))
+        directions *= 1.5/np.linalg.norm(directions, axis=1)[:, np.newaxis]
+
+        start = perf_counter()
+        field = Arrow3DField(starts, directions, colors=BLUE)
+        build_time = perf_counter() - start
+        start = perf_counter()
+        for _ in range(10):
+            field.set_vectors(directions[::-1], starts)
+        update_time = (perf_counter() - start)/10
+
+        message = (
+            f"{n_arrows:>6} arrows: field build {build_time*1e3:7.1f} ms, "
+            f"bulk update {update_time*1e3:6.1f} ms, "
+            f"{field.get_num_points()} vertices"
+        )
+        if n_arrows <= 1000:
+            start = perf_counter()
+            separate = build_separately(starts, directions)
+            separate_time = perf_counter() - start
+            n_points = sum(sm.get_num_points() for sm in separate.get_family())
+            message += f" (separate build {separate_time*1e3:8.1f} ms, {n_points} vertices)"
+        print(message)
+
+    # Level of detail: the same 10000 arrows seen from further and further away
+    frame = CameraFrame()
+    frame.reorient(-130, 67)
+    for height in [8, 30, 100]:
+        frame.set_height(height)
+        start = perf_counter()
+        field.update_level_of_detail(frame)
+        lod_time = perf_counter() - start
+        counts = np.bincount(field.tiers, minlength=len(field.resolutions))
+        print(
+            f"frame height {height:>3}: tiers {counts}, {field.get_num_points()} vertices, "
+            f"{lod_time*1e3:5.1f} ms to switch"
+        )
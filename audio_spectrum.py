@@ -0,0 +1,195 @@
+import numpy as np
+from scipy.io import wavfile
+from scipy.optimize import linear_sum_assignment
+
+
+# Streaming short-time Fourier analysis of a WAV file. The file is memory
+# mapped and read one block of windows at a time, so memory use depends on the
+# block size and not on how long the recording is. Each window is reduced to
+# its K strongest partials (amplitude and frequency), which is what the
+# Fourier scenes draw.
+
+
+def open_wav(path):
+    # Returns the sample rate and a memory-mapped (samples,) or
+    # (samples, channels) array, without reading the file in
+    sample_rate, data = wavfile.read(path, mmap=True)
+    return sample_rate, data
+
+
+def to_float_mono(block):
+    block = np.asarray(block)
+    if block.dtype == np.uint8:
+        # 8-bit WAV is unsigned, centred on 128
+        block = (block.astype(np.float32) - 128)/128
+    elif np.issubdtype(block.dtype, np.integer):
+        scale = float(np.iinfo(block.dtype).max)
+        block = block.astype(np.float32)/scale
+    else:
+        block = block.astype(np.float32)
+    if block.ndim == 2:
+        block = block.mean(1)
+    return block
+
+
+class StreamingSTFT:
+    def __init__(self, path, window_size=2048, hop_size=512, n_partials=7, max_freq=None, windows_per_block=64):
+        self.sample_rate, self.data = open_wav(path)
+        self.n_samples = len(self.data)
+        self.window_size = window_size
+        self.hop_size = hop_size
+        self.n_partials = n_partials
+        self.max_freq = max_freq
+        self.windows_per_block = windows_per_block
+
+        self.window = np.hanning(window_size).astype(np.float32)
+        # A full-scale sinusoid centred on a bin peaks at sum(window)/2
+        self.amplitude_scale = 2/self.window.sum()
+        self.n_windows = max(1 + (self.n_samples - window_size)//hop_size, 0)
+
+    def get_window_time(self, index):
+        # Time of the window's centre, in seconds
+        return (index*self.hop_size + self.window_size/2)/self.sample_rate
+
+    def iter_blocks(self, start_window=0):
+        # Yields (first window index, (windows, window_size) array) per block
+        for first in range(start_window, self.n_windows, self.windows_per_block):
+            n = min(self.windows_per_block, self.n_windows - first)
+            start = first*self.hop_size
+            end = start + (n - 1)*self.hop_size + self.window_size
+            samples = to_float_mono(self.data[start:end])
+            frames = np.lib.stride_tricks.sliding_window_view(samples, self.window_size)[::self.hop_size]
+            yield first, frames[:n]
+
+    def get_partials(self, frames):
+        # Top K spectral peaks of each frame: (windows, K) amplitudes and
+        # frequencies in Hz, strongest first
+        spectra = np.abs(np.fft.rfft(frames*self.window, axis=1))
+        # Only local maxima count as partials, not the skirts of a strong peak
+        is_peak = np.zeros(spectra.shape, dtype=bool)
+        is_peak[:, 1:-1] = (spectra[:, 1:-1] > spectra[:, :-2]) & (spectra[:, 1:-1] >= spectra[:, 2:])
+        if self.max_freq is not None:
+            is_peak[:, int(self.max_freq*self.window_size/self.sample_rate) + 1:] = False
+        peak_mags = np.where(is_peak, spectra, 0)
+
+        k = min(self.n_partials, spectra.shape[1] - 2)
+        bins = np.argpartition(peak_mags, -k, axis=1)[:, -k:]
+        order = np.argsort(np.take_along_axis(peak_mags, bins, 1), axis=1)[:, ::-1]
+        bins = np.take_along_axis(bins, order, 1)
+
+        # Parabolic interpolation on log magnitudes refines each peak's bin
+        bins = np.clip(bins, 1, spectra.shape[1] - 2)
+        log_spectra = np.log(spectra + 1e-12)
+        left = np.take_along_axis(log_spectra, bins - 1, 1)
+        center = np.take_along_axis(log_spectra, bins, 1)
+        right = np.take_along_axis(log_spectra, bins + 1, 1)
+        denom = left - 2*center + right
+        offset = np.where(np.abs(denom) > 1e-12, 0.5*(left - right)/np.where(denom == 0, 1, denom), 0)
+        amplitudes = np.exp(center - 0.25*(left - right)*offset)*self.amplitude_scale
+        freqs = (bins + offset)*self.sample_rate/self.window_size
+
+        # Windows with no peak at all contribute silence
+        found = np.take_along_axis(peak_mags, bins, 1) > 0
+        return np.where(found, amplitudes, 0), freqs
+
+    def iter_partials(self, start_window=0):
+        # Yields (time, amplitudes, freqs) for every window in order
+        for first, frames in self.iter_blocks(start_window):
+            amplitudes, freqs = self.get_partials(frames)
+            for i in range(len(frames)):
+                yield self.get_window_time(first + i), amplitudes[i], freqs[i]
+
+
+class PartialStream:
+    # Partials at an arbitrary time t, read forward through a StreamingSTFT
+    # and interpolated between the two windows around t. Only those two
+    # windows are held, so moving forward in time (as a scene does) never
+    # buffers more than one block of audio.
+    #
+    # Partials come out as tracks rather than strongest first: the first
+    # window is sorted by frequency, and each later one is matched slot by
+    # slot to the one before, nearest frequency to nearest frequency. A
+    # track glides between windows when its frequency moved by at most
+    # max_glide Hz, and otherwise fades out and back in at the new frequency,
+    # so a change in the ranking never shows up as a frequency sweep.
+    def __init__(self, stft, max_glide=None):
+        self.stft = stft
+        # Two bins by default
+        self.max_glide = 2*stft.sample_rate/stft.window_size if max_glide is None else max_glide
+        self.restart()
+
+    def restart(self):
+        self.iterator = self.stft.iter_partials()
+        self.previous = self.next = self.match_window(None, next(self.iterator, None))
+        self.advance()
+        # Whether previous is still the first window, so an earlier t only
+        # has to be clamped to it rather than read again from the start
+        self.at_first_window = True
+
+    def advance(self):
+        self.previous, self.next = self.next, self.match_window(self.next, next(self.iterator, None))
+        self.at_first_window = False
+
+    def match_window(self, reference, window):
+        # The window's partials reordered to line up with reference's slots
+        if window is None:
+            return None
+        t, amplitudes, freqs = window
+        if reference is None:
+            order = np.argsort(freqs)
+        else:
+            order = np.empty(len(freqs), dtype=int)
+            rows, columns = linear_sum_assignment(np.abs(reference[2][:, np.newaxis] - freqs))
+            order[rows] = columns
+        return t, amplitudes[order], freqs[order]
+
+    def get_partials(self, t):
+        if self.previous is None:
+            zeros = np.zeros(self.stft.n_partials)
+            return zeros, zeros
+        if t < self.previous[0] and not self.at_first_window:
+            self.restart()
+        while self.next is not None and self.next[0] <= t:
+            self.advance()
+
+        t0, amplitudes0, freqs0 = self.previous
+        if self.next is None or t <= t0:
+            return amplitudes0, freqs0
+        t1, amplitudes1, freqs1 = self.next
+        alpha = (t - t0)/(t1 - t0)
+        amplitudes = (1 - alpha)*amplitudes0 + alpha*amplitudes1
+        freqs = (1 - alpha)*freqs0 + alpha*freqs1
+
+        # Tracks that jumped cross-fade through silence instead
+        jumped = np.abs(freqs1 - freqs0) > self.max_glide
+        if alpha < 0.5:
+            amplitudes[jumped] = (1 - 2*alpha)*amplitudes0[jumped]
+            freqs[jumped] = freqs0[jumped]
+        else:
+            amplitudes[jumped] = (2*alpha - 1)*amplitudes1[jumped]
+            freqs[jumped] = freqs1[jumped]
+        return amplitudes, freqs
+
+
+if __name__ == "__main__":
+    import argparse
+    import tracemalloc
+    from time import perf_counter
+
+    parser = argparse.ArgumentParser(description="Stream the strongest partials out of a WAV file")
+    parser.add_argument("path", nargs="?", default="extra_media/clack.wav")
+    parser.add_argument("-k", "--partials", type=int, default=7)
+    args = parser.parse_args()
+
+    stft = StreamingSTFT(args.path, n_partials=args.partials)
+    tracemalloc.start()
+    start = perf_counter()
+    n_windows = 0
+    for t, amplitudes, freqs in stft.iter_partials():
+        n_windows += 1
+    elapsed = perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    duration = stft.n_samples/stft.sample_rate
+    print(f"{duration:.2f} s of audio, {n_windows} windows in {elapsed*1e3:.1f} ms, peak memory {peak/2**20:.2f} MiB")
+    print(f"Strongest partial in the last window: {freqs[0]:.1f} Hz at amplitude {amplitudes[0]:.4f}")
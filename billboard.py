@@ -0,0 +1,162 @@
+from manimlib import *
+import numpy as np
+
+
+# Labels in a 3D scene that keep facing the camera. Each label's glyphs are
+# built once and kept flat in the xy-plane, centered on the origin. Facing
+# the camera is then a rotation of those points by the frame's orientation
+# and a shift to each label's anchor, done for every label in one matrix
+# product, rather than rebuilding the Text each frame.
+#
+#     labels = BillboardLabels(BillboardLabel("A", 1.1*vec), ...)
+#     add_billboard_updater(labels, self.frame)
+
+
+def get_camera_facing_matrix(frame):
+    # The rotation taking the xy-plane onto the frame's view plane, from its
+    # euler angles in the same way CameraFrame.set_euler_angles builds it
+    angles = frame.get_euler_angles()
+    return Rotation.from_euler(frame.euler_axes, angles[::-1]).as_matrix()
+
+
+class BillboardLabel(Text):
+    def __init__(self, text, anchor=ORIGIN, **kwargs):
+        super().__init__(text, **kwargs)
+        self.anchor = np.array(anchor, dtype=float)
+        self.center()
+        self.flat_points = [sm.get_points().copy() for sm in self.get_billboard_members()]
+        self.flat_normals = [sm.get_unit_normal() for sm in self.get_billboard_members()]
+        self.shift(self.anchor)
+
+    def get_billboard_members(self):
+        return self.family_members_with_points()
+
+    def set_anchor(self, anchor):
+        self.shift(anchor - self.anchor)
+        self.anchor = np.array(anchor, dtype=float)
+        return self
+
+    def face_camera(self, frame):
+        return self.orient(get_camera_facing_matrix(frame))
+
+    def orient(self, matrix):
+        for sm, points, normal in zip(self.get_billboard_members(), self.flat_points, self.flat_normals):
+            set_billboard_points(sm, points @ matrix.T + self.anchor, matrix @ normal)
+        note_billboards_changed(self)
+        return self
+
+
+def set_billboard_points(vmobject, points, normal):
+    # Callers note the change on the whole family once they're done, rather
+    # than each glyph walking up through its parents
+    vmobject.data["point"][:] = points
+    vmobject.data["base_normal"][1::2] = normal
+    vmobject.needs_new_unit_normal = False
+
+
+def note_billboards_changed(mobject):
+    for mob in mobject.get_family():
+        mob._data_has_changed = True
+        mob._needs_new_bounding_box = True
+    mobject.note_changed_data()
+    mobject.refresh_bounding_box()
+
+
+class BillboardLabels(VGroup):
+    # Orients all of its BillboardLabels at once. The flat points of every
+    # glyph are stacked, so a frame costs one (points, 3) x (3, 3) product
+    # and a slice assignment per glyph.
+    def __init__(self, *labels, **kwargs):
+        super().__init__(*labels, **kwargs)
+        self.refresh_billboard_layout()
+
+    def refresh_billboard_layout(self):
+        # Call after adding or removing labels
+        self.members = []
+        self.slices = []
+        flat_points, flat_normals, owners = [], [], []
+        start = 0
+        for index, label in enumerate(self.submobjects):
+            for sm, points, normal in zip(label.get_billboard_members(), label.flat_points, label.flat_normals):
+                self.members.append(sm)
+                self.slices.append(slice(start, start + len(points)))
+                flat_points.append(points)
+                flat_normals.append(normal)
+                owners.append(np.full(len(points), index))
+                start += len(points)
+        self.flat_points = np.vstack([np.zeros((0, 3)), *flat_points])
+        self.flat_normals = np.array(flat_normals).reshape(-1, 3)
+        self.owners = np.hstack([np.zeros(0, dtype=int), *owners])
+        return self
+
+    def get_anchors(self):
+        return np.array([label.anchor for label in self.submobjects]).reshape(-1, 3)
+
+    def face_camera(self, frame):
+        return self.orient(get_camera_facing_matrix(frame))
+
+    def orient(self, matrix):
+        points = self.flat_points @ matrix.T
+        points += self.get_anchors()[self.owners]
+        normals = self.flat_normals @ matrix.T
+        for sm, part, normal in zip(self.members, self.slices, normals):
+            set_billboard_points(sm, points[part], normal)
+        note_billboards_changed(self)
+        return self
+
+
+def add_billboard_updater(labels, frame):
+    # One updater for a BillboardLabel or BillboardLabels, which only does
+    # any work on frames where the camera turned
+    last_orientation = None
+
+    def update_labels(m):
+        nonlocal last_orientation
+        orientation = frame.get_orientation().as_quat()
+        if last_orientation is None or not np.array_equal(orientation, last_orientation):
+            m.face_camera(frame)
+            last_orientation = orientation
+    return labels.add_updater(update_labels)
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    frame = CameraFrame()
+    frame.reorient(-130, 67)
+    theta, phi = frame.get_euler_angles()[:2]
+    n_frames = 30
+
+    def rebuild(m):
+        # What label_updater in visualise_vectorisation.py used to do
+        m.become(Text("Test", font_size=24)).rotate(phi, axis=RIGHT).rotate(theta, axis=OUT).move_to(ORIGIN)
+
+    label = Text("Test", font_size=24)
+    start = perf_counter()
+    for _ in range(n_frames):
+        rebuild(label)
+    rebuild_time = (perf_counter() - start)/n_frames
+    print(f"become(Text):     {rebuild_time*1e3:7.3f} ms per label per frame")
+
+    billboard = BillboardLabel("Test", font_size=24)
+    start = perf_counter()
+    for _ in range(n_frames):
+        billboard.face_camera(frame)
+    billboard_time = (perf_counter() - start)/n_frames
+    print(f"BillboardLabel:   {billboard_time*1e3:7.3f} ms per label per frame")
+    # The same glyphs, up to where the label's center is taken
+    rebuilt_points, billboard_points = label.get_all_points(), billboard.get_all_points()
+    assert np.allclose(billboard_points - billboard_points[0], rebuilt_points - rebuilt_points[0], atol=1e-5)
+
+    rng = np.random.default_rng(0)
+    words = ["A", "B", "C", "Test", "Nearest", "Class"]
+    labels = BillboardLabels(*(
+        BillboardLabel(words[i % len(words)], anchor, font_size=24)
+        for i, anchor in enumerate(rng.uniform(-4, 4, (1000, 3)))
+    ))
+    start = perf_counter()
+    for _ in range(n_frames):
+        frame.increment_theta(0.01)
+        labels.face_camera(frame)
+    group_time = (perf_counter() - start)/n_frames
+    print(f"BillboardLabels:  {group_time*1e3:7.3f} ms per frame for {len(labels)} labels")
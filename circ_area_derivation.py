@@ -1,11 +1,14 @@
 from manimlib import *
 
+from derived import DerivedValue, add_dependent_updater
+from static_frames import StaticFrameReuse
+
 
 CREAM = "#FFFFC0"
 R = 3
 
 
-class Area(InteractiveScene):
+class Area(StaticFrameReuse, InteractiveScene):
     def construct(self):
         # Function definitions
         t2c={'r' : ORANGE,
@@ -81,6 +84,8 @@ class Area(InteractiveScene):
         
         N_tracker = ValueTracker(6)
         def get_N(): return int(N_tracker.get_value())
+        # Only changes when N crosses an integer, so the rebuilds below run once per new N
+        N_value = DerivedValue(int, N_tracker)
         N = get_N()
         angle = 2*PI/N
         
@@ -228,13 +233,13 @@ class Area(InteractiveScene):
         
         def add_updaters():
             # Add updaters
-            circ_grp[0].add_updater(lambda c: c.become(get_new_circle(get_N(), color=c[0].get_fill_color()).scale(0.6).move_to(c)))
-            circ_grp[1].add_updater(lambda a: a.become(Arc(angle=2*PI/get_N(), radius=0.6*0.6, arc_center=circ_grp[0].get_center(), stroke_width=2)))
+            add_dependent_updater(circ_grp[0], lambda c: c.become(get_new_circle(get_N(), color=c[0].get_fill_color()).scale(0.6).move_to(c)), N_value)
+            add_dependent_updater(circ_grp[1], lambda a: a.become(Arc(angle=2*PI/get_N(), radius=0.6*0.6, arc_center=circ_grp[0].get_center(), stroke_width=2)), N_value)
 
-            r_grp.add_updater(r_updater)
+            add_dependent_updater(r_grp, r_updater, N_value)
 
             # sector_grp.add_updater(lambda s: s.become(get_sector_grp(N).move_to(s)))
-            triangle_grp.add_updater(lambda t: t.become(get_triangle_grp(get_N(), color=t2c['A']).move_to(t)))
+            add_dependent_updater(triangle_grp, lambda t: t.become(get_triangle_grp(get_N(), color=t2c['A']).move_to(t)), N_value)
             # self.play(Indicate(sector_grp), run_time=0.001)
 
         def remove_updaters():
@@ -0,0 +1,129 @@
+from manimlib import *
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+# Nearest-class classification of many points at once. With few classes all
+# squared distances come from one matrix product, |p|^2 - 2 p.c + |c|^2, done
+# in blocks of points to bound memory. With many classes a KD-tree over the
+# class vectors answers each point in about log(classes) steps instead.
+# The threshold below comes from the benchmark at the bottom of this file.
+
+# A KD-tree wins from this many classes on
+KD_TREE_MIN_CLASSES = 48
+# Points per block of the distance matrix, times the number of classes
+MAX_BLOCK_SIZE = 2**22
+
+
+def choose_method(n_classes):
+    return "kd_tree" if n_classes >= KD_TREE_MIN_CLASSES else "matrix"
+
+
+def get_squared_distances(points, class_vectors):
+    # (points, classes) squared distances
+    squared = np.einsum("ij,ij->i", points, points)[:, np.newaxis] - 2*points @ class_vectors.T
+    squared += np.einsum("ij,ij->i", class_vectors, class_vectors)
+    return np.maximum(squared, 0, out=squared)
+
+
+def classify(points, class_vectors, method="auto"):
+    # Index of the nearest class vector to each point, and the distance to it
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    class_vectors = np.asarray(class_vectors, dtype=float).reshape(-1, 3)
+    if method == "auto":
+        method = choose_method(len(class_vectors))
+
+    if method == "kd_tree":
+        distances, labels = cKDTree(class_vectors).query(points, workers=-1)
+        return labels, distances
+    if method != "matrix":
+        raise ValueError(f"Unknown method {method!r}, expected 'matrix' or 'kd_tree'")
+
+    labels = np.empty(len(points), dtype=int)
+    distances = np.empty(len(points))
+    block_size = max(MAX_BLOCK_SIZE//max(len(class_vectors), 1), 1)
+    for start in range(0, len(points), block_size):
+        block = slice(start, start + block_size)
+        squared = get_squared_distances(points[block], class_vectors)
+        labels[block] = squared.argmin(1)
+        distances[block] = np.sqrt(np.take_along_axis(squared, labels[block, np.newaxis], 1)[:, 0])
+    return labels, distances
+
+
+class NearestClassCloud(DotCloud):
+    # Sample points colored by their nearest class vector. Moving the class
+    # vectors reclassifies every point and rewrites the colors in one go.
+    def __init__(
+        self,
+        points,
+        class_vectors,
+        class_colors,
+        radius : float = 0.02,
+        method : str = "auto",
+        **kwargs
+    ):
+        self.method = method
+        self.class_rgbas = np.array([color_to_rgba(color) for color in class_colors])
+        self.class_vectors = np.array(class_vectors, dtype=float).reshape(-1, 3)
+        self.labels = None
+        super().__init__(points, radius=radius, **kwargs)
+        self.refresh_classes()
+
+    def refresh_classes(self):
+        labels, self.distances = classify(self.get_points(), self.class_vectors, self.method)
+        if self.labels is not None and np.array_equal(labels, self.labels):
+            return self
+        self.labels = labels
+        opacities = self.data["rgba"][:, 3].copy()
+        self.data["rgba"][:] = self.class_rgbas[labels]
+        self.data["rgba"][:, 3] *= opacities
+        self.note_changed_data()
+        return self
+
+    def set_class_vectors(self, class_vectors):
+        self.class_vectors = np.array(class_vectors, dtype=float).reshape(-1, 3)
+        return self.refresh_classes()
+
+    def set_class_colors(self, class_colors):
+        self.class_rgbas = np.array([color_to_rgba(color) for color in class_colors])
+        self.labels = None
+        return self.refresh_classes()
+
+    def get_class_counts(self):
+        return np.bincount(self.labels, minlength=len(self.class_vectors))
+
+
+if __name__ == "__main__":
+    from timeit import timeit
+
+    def loop_classify(points, class_vectors):
+        # One norm per point and class, as in NearestVectorClassification3D
+        labels = []
+        for point in points:
+            distances = [np.linalg.norm(point - vector) for vector in class_vectors]
+            labels.append(np.argmin(distances))
+        return np.array(labels)
+
+    rng = np.random.default_rng(0)
+    points = rng.normal(size=(100000, 3))
+    small = points[:1000]
+    class_vectors = rng.normal(size=(3, 3))
+    loop_time = timeit(lambda: loop_classify(small, class_vectors), number=1)
+    matrix_time = timeit(lambda: classify(small, class_vectors), number=20)/20
+    assert np.array_equal(loop_classify(small, class_vectors), classify(small, class_vectors)[0])
+    print(f"1000 points, 3 classes: loop {loop_time*1e3:.1f} ms, matrix {matrix_time*1e3:.3f} ms")
+
+    # Where the KD-tree overtakes the matrix product
+    for n_classes in [4, 8, 16, 32, 48, 64, 128]:
+        class_vectors = rng.normal(size=(n_classes, 3))
+        matrix_labels = classify(points, class_vectors, "matrix")[0]
+        assert np.array_equal(matrix_labels, classify(points, class_vectors, "kd_tree")[0])
+        times = {
+            method: timeit(lambda: classify(points, class_vectors, method), number=5)/5
+            for method in ["matrix", "kd_tree"]
+        }
+        print(
+            f"100000 points, {n_classes:>3} classes: "
+            + ", ".join(f"{method} {t*1e3:6.1f} ms" for method, t in times.items())
+            + f" -> auto uses {choose_method(n_classes)}"
+        )
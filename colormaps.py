@@ -0,0 +1,126 @@
+from manimlib import *
+from functools import lru_cache
+import numpy as np
+
+
+# Coloring mobjects by a scalar per point, such as height on a surface,
+# through a lookup table: values are normalized into a clipping range, and
+# each one is interpolated between two neighbouring table entries. A whole
+# color buffer is written in a few array operations, for surfaces, curves
+# and dot clouds alike.
+#
+#     set_color_by_coordinate(surface, "yellow_to_dark_blue", vmin=z_min, vmax=z_max)
+
+LOOKUP_TABLE_SIZE = 256
+
+# Named gradients, as rgb stops, alongside manimlib's named colormaps
+# ("3b1b_colormap", "viridis", "magma", "plasma" and so on)
+GRADIENTS = {
+    "yellow_to_dark_blue": [(1, 1, 0), (0, 0, 0.5)],
+}
+
+
+def get_lookup_table(colormap, size=LOOKUP_TABLE_SIZE):
+    # colormap is a name or a list of colors (manim colors or rgb triples)
+    if not isinstance(colormap, str):
+        # As rgb tuples, so the table can be cached
+        colormap = tuple(
+            tuple(map(float, color_to_rgb(color) if isinstance(color, (str, Color)) else color))
+            for color in colormap
+        )
+    return get_cached_lookup_table(colormap, size)
+
+
+@lru_cache
+def get_cached_lookup_table(colormap, size):
+    if colormap in GRADIENTS:
+        rgbs = GRADIENTS[colormap]
+    elif isinstance(colormap, str):
+        rgbs = get_colormap_list(colormap, size)
+    else:
+        rgbs = colormap
+    table = resize_with_interpolation(np.array(rgbs, dtype=float), size)
+    table.setflags(write=False)
+    return table
+
+
+def apply_colormap(values, colormap, vmin=None, vmax=None):
+    # (N,) values to (N, 3) rgb, clipped to [vmin, vmax], which default to the
+    # range of the values
+    values = np.asarray(values, dtype=float).ravel()
+    table = get_lookup_table(colormap)
+    if len(values) == 0:
+        return np.zeros((0, 3))
+    if vmin is None:
+        vmin = values.min()
+    if vmax is None:
+        vmax = values.max()
+    scale = (len(table) - 1)/(vmax - vmin) if vmax != vmin else 0.0
+
+    positions = (values - vmin)*scale
+    np.clip(positions, 0, len(table) - 1, out=positions)
+    indices = np.minimum(positions.astype(int), len(table) - 2)
+    positions -= indices
+    lower = table[indices]
+    return lower + positions[:, np.newaxis]*(table[indices + 1] - lower)
+
+
+def get_rgba_keys(mobject):
+    # rgba for surfaces and dot clouds, fill_rgba and stroke_rgba for curves
+    return [name for name in mobject.data.dtype.names if name.endswith("rgba")]
+
+
+def set_color_by_values(mobject, values, colormap, vmin=None, vmax=None, opacity=None, keys=None):
+    # One value per point of mobject itself. The current opacity is kept
+    # unless one is given.
+    rgbs = apply_colormap(values, colormap, vmin, vmax)
+    for key in keys or get_rgba_keys(mobject):
+        mobject.data[key][:, :3] = rgbs
+        if opacity is not None:
+            mobject.data[key][:, 3] = opacity
+    mobject.note_changed_data()
+    return mobject
+
+
+def set_color_by_coordinate(mobject, colormap, axis=2, vmin=None, vmax=None, opacity=None, keys=None, recurse=True):
+    # Colors every point by one of its coordinates, z by default. Without a
+    # clipping range, the range is taken over the whole family.
+    family = [mob for mob in mobject.get_family(recurse) if mob.has_points()]
+    if not family:
+        return mobject
+    if vmin is None or vmax is None:
+        coordinates = np.hstack([mob.get_points()[:, axis] for mob in family])
+        vmin = coordinates.min() if vmin is None else vmin
+        vmax = coordinates.max() if vmax is None else vmax
+    for mob in family:
+        set_color_by_values(mob, mob.get_points()[:, axis], colormap, vmin, vmax, opacity, keys)
+    return mobject
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    def rgb_func(point, z_min=-1, z_max=1):
+        # The per-point callback plot_surface.py used
+        normalized_z = np.clip((point[2] - z_min)/(z_max - z_min), 0, 1)
+        return np.array([1 - normalized_z, 1 - normalized_z, 0.5*normalized_z])
+
+    for n in [100, 300, 1000]:
+        u = np.linspace(-3, 3, n)
+        x, y = np.meshgrid(u, u)
+        points = np.array([x.ravel(), y.ravel(), np.sin(x*y).ravel()]).T
+        cloud = DotCloud(points)
+
+        start = perf_counter()
+        set_color_by_coordinate(cloud, "yellow_to_dark_blue", vmin=-1, vmax=1)
+        table_time = perf_counter() - start
+        message = f"{n*n:>8} points: lookup table {table_time*1e3:7.1f} ms"
+
+        if n <= 300:
+            rgbas = cloud.data["rgba"].copy()
+            start = perf_counter()
+            cloud.set_color_by_rgb_func(rgb_func)
+            func_time = perf_counter() - start
+            assert np.allclose(rgbas, cloud.data["rgba"], atol=1e-6)
+            message += f", rgb_func {func_time*1e3:8.1f} ms ({func_time/table_time:.0f}x)"
+        print(message)
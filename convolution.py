@@ -1,17 +1,19 @@
 from manimlib import *
 import numpy as np
 
+from convolution_tracker import ConvolutionTracker
+from derived import add_dependent_updater, add_derived_updater
+from polyline import set_points_as_simplified_corners
+from scene_loops import play_loop
+from signals import rect, tri
+from static_frames import StaticFrameReuse
 
-def step(lower, upper, x):
-    return np.array([1 if lower <= i <= upper else 0 for i in x])
 
-
-class VisualiseConvolution(InteractiveScene):
-    def f1(self, x):
-        return np.array([i + 1 if -1 <= i <= 0 else -i + 1 if 0 <= i <= 1 else 0 for i in x])
-
-    def f2(self, x):
-        return step(-0.5, 0.5, x)
+class VisualiseConvolution(StaticFrameReuse, InteractiveScene):
+    f1 = tri()
+    f2 = rect(-0.5, 0.5)
+    # Seconds of sweeping to show before the scene ends
+    loop_duration = 600
 
     def construct(self):
 
@@ -91,26 +93,29 @@ class VisualiseConvolution(InteractiveScene):
 
         f1 = self.f1(x)
         c1 = VMobject()
-        c1.set_points_as_corners(ax1.c2p(x,f1))
+        set_points_as_simplified_corners(c1, ax1.c2p(x,f1), camera=self.camera)
         c1.set_stroke(color=YELLOW_B, width=2)
         self.add(c1)
 
         f2 = self.f2(x)
         c2 = VMobject()
-        c2.set_points_as_corners(ax2.c2p(x,f2))
+        set_points_as_simplified_corners(c2, ax2.c2p(x,f2), camera=self.camera)
         c2.set_stroke(color=BLUE_C, width=2)
         self.add(c2)
 
         f3 = f1 * f2
         c3 = VMobject()
-        c3.set_points_as_corners(ax3.c2p(x,f3))
+        set_points_as_simplified_corners(c3, ax3.c2p(x,f3), camera=self.camera)
         c3.set_stroke(color=TEAL_C, width=2)
         c3.set_fill(color=TEAL_C, opacity=0.3)
         self.add(c3)
 
-        conv = np.convolve(f1,f2,'same') * (x[1]-x[0])
+        s_tracker = ValueTracker(0)
+        get_s = s_tracker.get_value
+        conv_tracker = ConvolutionTracker(self.f1, self.f2, x, s_tracker)
+
         c4 = VMobject()
-        c4.set_points_as_corners(ax4.c2p(x,conv))
+        set_points_as_simplified_corners(c4, ax4.c2p(conv_tracker.s_values, conv_tracker.conv_values), camera=self.camera)
         c4.set_stroke(color=TEAL_C, width=2)
         self.add(c4)       
 
@@ -121,20 +126,16 @@ class VisualiseConvolution(InteractiveScene):
 
         self.add(conv_formula)
 
-        init_a = np.trapz(f3, x)
+        init_a = conv_tracker.get_value()
 
         a_text = TexText(f"Area = {init_a:.6f}", font_size=36).set_color(TEAL_C).next_to(conv_formula, direction=DOWN, buff=0.5)
 
         a_val = a_text.make_number_changeable(f"{init_a:.6f}")
         
-        def get_area():
-            return a_val.get_value()
+        get_area = conv_tracker.get_value
 
         self.add(a_text)
 
-        s_tracker = ValueTracker(0)
-        get_s = s_tracker.get_value
-
         s_pointer = ArrowTip(
                     angle=PI/2, 
                     color=BLUE_C,
@@ -147,50 +148,33 @@ class VisualiseConvolution(InteractiveScene):
         s_text = Tex(f"s = {get_s()}", font_size=22)
         s_val = s_text.make_number_changeable(f"{get_s()}")
 
-        def s_val_updater(a):
-            global f2, f3
-            f2 = self.f2(get_s()-x)
-            f3 = f1*f2
-            a.set_value(get_s())
-
-        s_val.add_updater(s_val_updater)
+        add_dependent_updater(s_val, lambda a: a.set_value(get_s()), s_tracker)
 
         s_group = VGroup(s_text, s_pointer).arrange(UP).move_to(ax2.c2p(get_s(),0), UP)
-        s_group.add_updater(lambda p: p.move_to(ax2.c2p(get_s(),0), UP).shift(DOWN*0))
+        add_dependent_updater(s_group, lambda p: p.move_to(ax2.c2p(get_s(),0), UP).shift(DOWN*0), s_tracker)
 
         self.add(s_group)
 
         # self.toggle_selection_mode()
 
-        def area_updater(tracker):
-            global f3
-            tracker.set_value(np.trapz(f3, x))
-
-        a_val.add_updater(area_updater)
+        add_dependent_updater(a_val, lambda tracker: tracker.set_value(conv_tracker.get_value()), s_tracker)
 
         s_dot = GlowDot(ax4.c2p(get_s(), get_area()), color=WHITE)
         s_line = Line(ax4.c2p(get_s(),0), ax4.c2p(get_s(), get_area()), stroke_width=1, color=WHITE)
         self.add(s_dot, s_line)
 
-        s_dot.add_updater(lambda d: d.move_to(ax4.c2p(get_s(), get_area())))
-        s_line.add_updater(lambda l: l.put_start_and_end_on(ax4.c2p(get_s(),0), ax4.c2p(get_s(), get_area())))
-
-        def c2_updater(curve):
-            global f2
-            f2 = self.f2(get_s()-x)
-            curve.set_points_as_corners(ax2.c2p(x,f2))
-        c2.add_updater(c2_updater)
+        add_dependent_updater(s_dot, lambda d: d.move_to(ax4.c2p(get_s(), get_area())), s_tracker)
+        add_dependent_updater(s_line, lambda l: l.put_start_and_end_on(ax4.c2p(get_s(),0), ax4.c2p(get_s(), get_area())), s_tracker)
 
-        def c3_updater(curve):
-            global f3
-            curve.set_points_smoothly(ax3.c2p(x,f3))
-        c3.add_updater(c3_updater)
+        add_derived_updater(c2, lambda curve, kernel: set_points_as_simplified_corners(curve, ax2.c2p(x, kernel), camera=self.camera), conv_tracker.kernel)
+        add_derived_updater(c3, lambda curve, product: set_points_as_simplified_corners(curve, ax3.c2p(x, product), camera=self.camera), conv_tracker.product)
 
 
-        # for _ in range(10):
-        while True:    
+        def sweep():
             self.wait(2)
             self.play(s_tracker.animate.set_value(-2.5), run_time=1)
             self.wait()
             self.play(s_tracker.animate.set_value(2.5), run_time=5, rate_func=smooth)
             self.play(s_tracker.animate.set_value(0), run_time=1.5)
+
+        play_loop(self, sweep, duration=self.loop_duration)
@@ -0,0 +1,42 @@
+import numpy as np
+
+from derived import DerivedValue
+from fast_convolution import convolve
+
+
+class ConvolutionTracker:
+    # Follows a sliding kernel g(s - x) across f(x), driven by s_tracker.
+    # [f*g](s) is computed once over the whole s-range and read back by
+    # interpolation, and the kernel and product curves are derived values, so
+    # they are rebuilt at most once per value of s, however many updaters ask
+    # for them.
+    def __init__(self, f, g, x, s_tracker):
+        self.f = f
+        self.g = g
+        self.x = np.asarray(x, dtype=float)
+        self.s_tracker = s_tracker
+        self.dx = self.x[1] - self.x[0]
+
+        self.f_values = f(self.x)
+        # g sampled at every lag s - x between x[0] - x[-1] and x[-1] - x[0],
+        # so that the 'valid' output lines up with s = x for any grid x
+        lags = np.concatenate([self.x[0] - self.x[:0:-1], self.x - self.x[0]])
+        self.s_values = self.x
+        self.conv_values = convolve(self.f_values, g(lags), "valid")*self.dx
+
+        self.kernel = DerivedValue(lambda s: self.g(s - self.x), s_tracker)
+        self.product = DerivedValue(lambda kernel: self.f_values*kernel, self.kernel)
+
+    def get_s(self):
+        return self.s_tracker.get_value()
+
+    def get_kernel(self):
+        return self.kernel.get_value()
+
+    def get_product(self):
+        return self.product.get_value()
+
+    def get_value(self, s=None):
+        if s is None:
+            s = self.get_s()
+        return np.interp(s, self.s_values, self.conv_values)
@@ -0,0 +1,88 @@
+import numpy as np
+
+
+# Per-frame quantities derived from ValueTrackers, shared between updaters.
+# Each one is computed lazily on first use in a frame and then cached until a
+# source changes, so however many updaters read it, and in whatever order they
+# run, it is evaluated once and every reader sees the same value.
+#
+#     kernel = DerivedValue(lambda s: g(s - x), s_tracker)
+#     product = DerivedValue(lambda k: f_values*k, kernel)
+#     add_derived_updater(curve, lambda c, p: c.set_points_as_corners(axes.c2p(x, p)), product)
+#
+# Updaters attached this way, or with add_dependent_updater, are skipped on
+# frames where none of their sources changed, such as during a wait.
+
+
+def values_equal(value1, value2):
+    try:
+        return bool(np.array_equal(value1, value2))
+    except (ValueError, TypeError):
+        return False
+
+
+class SourceWatcher:
+    # Reports whether any of a set of ValueTrackers or DerivedValues changed
+    # since it was last asked
+    def __init__(self, sources):
+        self.sources = sources
+        self.keys = None
+
+    def get_key(self, source):
+        if isinstance(source, DerivedValue):
+            source.get_value()
+            return source.version
+        return np.array(source.get_value())
+
+    def has_changed(self):
+        keys = [self.get_key(source) for source in self.sources]
+        changed = self.keys is None or any(
+            not np.array_equal(key, old_key)
+            for key, old_key in zip(keys, self.keys)
+        )
+        self.keys = keys
+        return changed
+
+
+class DerivedValue:
+    def __init__(self, func, *sources):
+        # Sources are ValueTrackers or other DerivedValues
+        self.func = func
+        self.sources = sources
+        self.watcher = SourceWatcher(sources)
+        self.value = None
+        # Bumped only when a recompute gives a different value, so anything
+        # downstream of, say, int(N) stays put while N moves between integers
+        self.version = 0
+
+    def get_value(self):
+        if self.watcher.has_changed():
+            value = self.func(*(source.get_value() for source in self.sources))
+            if self.version == 0 or not values_equal(value, self.value):
+                self.value = value
+                self.version += 1
+        return self.value
+
+    def __call__(self):
+        return self.get_value()
+
+
+def add_dependent_updater(mobject, updater, *sources):
+    # updater(mobject) only runs on frames where one of the sources changed
+    watcher = SourceWatcher(sources)
+
+    def wrapped_updater(m):
+        if watcher.has_changed():
+            updater(m)
+    return mobject.add_updater(wrapped_updater)
+
+
+def add_derived_updater(mobject, updater, *derived_values):
+    # updater(mobject, *values) receives the current value of each quantity,
+    # and only runs when one of them changed
+    watcher = SourceWatcher(derived_values)
+
+    def wrapped_updater(m):
+        if watcher.has_changed():
+            updater(m, *(value.get_value() for value in derived_values))
+    return mobject.add_updater(wrapped_updater)
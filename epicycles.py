@@ -0,0 +1,193 @@
+from manimlib import *
+import numpy as np
+
+
+class Epicycles(VMobject):
+    # Draws a closed path with rotating phasors, the terms of its discrete
+    # Fourier series. Every circle and arm is a subpath of this one VMobject,
+    # written in place each frame from one cumulative sum over the phasors, so
+    # thousands of terms stay interactive. The path is drawn in its own plane
+    # and placed by an affine map; moves made since the last frame (shift,
+    # scale, rotate, also in 3D or through a parent) are read back from a few
+    # points and folded into that map, so they stick.
+    def __init__(
+        self,
+        path_points,
+        n_terms : int | None = None,
+        max_circles : int = 1000,
+        time_scale : float = 0.1,
+        circle_components : int = 8,
+        circle_color=BLUE_B,
+        circle_opacity : float = 0.35,
+        circle_width : float = 1.0,
+        arm_color=WHITE,
+        arm_opacity : float = 0.9,
+        arm_width : float = 1.5,
+        **kwargs
+    ):
+        # path_points is a closed path sampled evenly, (N, 2) or (N, 3)
+        path_points = np.asarray(path_points, dtype=float)
+        samples = path_points[:, 0] + 1j*path_points[:, 1]
+        n_samples = len(samples)
+        coefficients = np.fft.fft(samples)/n_samples
+        freqs = np.fft.fftfreq(n_samples, 1/n_samples)
+
+        # The constant term is the path's centre, not a rotating arm
+        self.offset = coefficients[0]
+        order = np.argsort(-np.abs(coefficients[1:])) + 1
+        if n_terms is not None:
+            order = order[:n_terms]
+        self.coefficients = coefficients[order]
+        self.omegas = TAU*freqs[order]
+        self.n_terms = len(order)
+        # Terms are sorted by size, so past the first few hundred the circles
+        # are well under a pixel; only the arms are drawn for those
+        self.n_circles = min(max_circles, self.n_terms)
+        self.time = 0.0
+        self.time_scale = time_scale
+
+        # Unit circle made of quadratic arcs, with handles outside it as in
+        # quadratic_bezier_points_for_arc
+        angles = np.linspace(0, TAU, 2*circle_components + 1)
+        radii = np.ones(len(angles))
+        radii[1::2] /= np.cos(PI/circle_components)
+        self.unit_circle = radii*np.exp(1j*angles)
+
+        # Every circle's points, then every arm's three, each followed by a
+        # handle on its last anchor to end the subpath
+        self.circle_size = len(self.unit_circle) + 1
+        self.arm_size = 4
+        self.circle_buffer = np.zeros((self.n_circles, self.circle_size), dtype=complex)
+        self.arm_buffer = np.zeros((self.n_terms, self.arm_size), dtype=complex)
+
+        # Where the path's own x and y axes point, and where its origin goes
+        self.placement = np.array([RIGHT, UP])
+        self.placement_shift = np.zeros(3)
+        self.written_samples = None
+
+        super().__init__(joint_type="no_joint", **kwargs)
+        self.refresh_epicycle_points()
+
+        n_circle_points = self.circle_buffer.size
+        self.data["stroke_rgba"][:n_circle_points] = color_to_rgba(circle_color, circle_opacity)
+        self.data["stroke_rgba"][n_circle_points:] = color_to_rgba(arm_color, arm_opacity)
+        self.data["stroke_width"][:n_circle_points, 0] = circle_width
+        self.data["stroke_width"][n_circle_points:, 0] = arm_width
+
+    def get_phasors(self, t=None):
+        if t is None:
+            t = self.time
+        return self.coefficients*np.exp(1j*t*self.omegas)
+
+    def get_tip(self, t=None):
+        return self.offset + self.get_phasors(t).sum()
+
+    def get_tip_point(self, t=None):
+        tip = self.get_tip(t)
+        return self.place(np.array([tip.real]), np.array([tip.imag]))[0]
+
+    def place(self, x, y):
+        # Points in the path's own plane to (N, 3) points in the scene
+        return np.outer(x, self.placement[0]) + np.outer(y, self.placement[1]) + self.placement_shift
+
+    def sync_placement(self):
+        # Fit the affine change between a spread of points as last written
+        # and as they are now
+        if self.written_samples is None:
+            return self
+        samples, local, written = self.written_samples
+        if self.get_num_points() <= samples[-1]:
+            return self
+        current = self.data["point"][samples]
+        if np.array_equal(current, written):
+            return self
+        local = np.hstack([local, np.ones((len(samples), 1))])
+        solution, _, rank, _ = np.linalg.lstsq(local, current, rcond=None)
+        if rank < 3:
+            self.placement_shift = self.placement_shift + (current - written).mean(0)
+        elif np.allclose(local @ solution, current, atol=1e-4):
+            self.placement = solution[:2]
+            self.placement_shift = solution[2]
+        # Anything else isn't a move, and is drawn over
+        return self
+
+    def set_time(self, t):
+        self.time = t
+        return self.refresh_epicycle_points()
+
+    def advance(self, dt):
+        return self.set_time(self.time + self.time_scale*dt)
+
+    def refresh_epicycle_points(self):
+        self.sync_placement()
+        tips = self.offset + np.cumsum(self.get_phasors())
+        centers = np.empty_like(tips)
+        centers[0] = self.offset
+        centers[1:] = tips[:-1]
+
+        n = self.n_circles
+        circles = self.circle_buffer
+        circles[:, :-1] = centers[:n, np.newaxis] + np.abs(self.coefficients[:n, np.newaxis])*self.unit_circle
+        circles[:, -1] = circles[:, -2]
+        arms = self.arm_buffer
+        arms[:, 0] = centers
+        arms[:, 1] = 0.5*(centers + tips)
+        arms[:, 2] = tips
+        arms[:, 3] = tips
+
+        n_points = circles.size + arms.size - 1
+        if self.get_num_points() != n_points:
+            self.set_points(np.zeros((n_points, 3)))
+        x = np.hstack([circles.real.ravel(), arms.real.ravel()[:-1]])
+        y = np.hstack([circles.imag.ravel(), arms.imag.ravel()[:-1]])
+        points = self.data["point"]
+        for k in range(3):
+            points[:, k] = self.placement_shift[k] + self.placement[0, k]*x + self.placement[1, k]*y
+
+        samples = np.linspace(0, n_points - 1, min(n_points, 64)).astype(int)
+        self.written_samples = (samples, np.array([x[samples], y[samples]]).T, points[samples].copy())
+        self.note_changed_data()
+        self.refresh_bounding_box()
+        return self
+
+    def get_joint_angles(self, refresh=False):
+        # Straight arms and circles drawn without joints, which spares a pass
+        # over every subpath each frame
+        return self.data["joint_angle"][:, 0]
+
+    def get_traced_path(self, n_samples=2000, **kwargs):
+        # The path the tip traces with the kept terms, over one period
+        ts = np.linspace(0, 1, n_samples)
+        phasors = self.coefficients*np.exp(1j*np.outer(ts, self.omegas))
+        values = self.offset + phasors.sum(1)
+        path = VMobject(**kwargs)
+        path.set_points_as_corners(self.place(values.real, values.imag))
+        return path
+
+
+def sample_mobject_path(mobject, n_samples=4096):
+    # Evenly spaced points along a mobject's outline, for use as path_points
+    return np.array([
+        mobject.quick_point_from_proportion(alpha)
+        for alpha in np.linspace(0, 1, n_samples, endpoint=False)
+    ])
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    # A closed, wiggly path with plenty of detail for the higher terms
+    thetas = np.linspace(0, TAU, 2**15, endpoint=False)
+    radii = 2 + 0.5*np.sin(5*thetas) + 0.2*np.sign(np.sin(37*thetas))
+    path = np.array([radii*np.cos(thetas), radii*np.sin(thetas)]).T
+
+    for n_terms in [1000, 5000, 20000]:
+        epicycles = Epicycles(path, n_terms=n_terms)
+        n_frames = 60
+        start = perf_counter()
+        for _ in range(n_frames):
+            epicycles.advance(1/30)
+            # Everything the renderer asks of the mobject on the CPU side
+            epicycles.get_shader_data()
+        elapsed = perf_counter() - start
+        print(f"{n_terms:>6} terms: {elapsed/n_frames*1000:6.2f} ms/frame ({n_frames/elapsed:6.1f} fps)")
@@ -0,0 +1,145 @@
+import numpy as np
+from scipy.fft import irfft, next_fast_len, rfft
+
+
+# np.convolve is a direct O(n*m) sum. For long signals one FFT of the whole
+# thing is far cheaper, and when the kernel is much shorter than the signal,
+# overlap-add (FFTs over blocks a few kernel lengths long) is cheaper again.
+# The thresholds below come from the benchmark at the bottom of this file.
+
+# A direct sum wins below this many multiply-adds, or for kernels this short
+DIRECT_MAX_OPS = 2e5
+DIRECT_MAX_KERNEL = 64
+# Overlap-add once the signal is this many times longer than the kernel
+OVERLAP_ADD_MIN_RATIO = 128
+# Overlap-add blocks are this many kernel lengths long
+OVERLAP_ADD_BLOCK_RATIO = 8
+
+
+def get_mode_slice(n, m, mode):
+    # Where each of np.convolve's modes sits within the full output
+    long, short = max(n, m), min(n, m)
+    if mode == "full":
+        return slice(0, n + m - 1)
+    if mode == "same":
+        start = (short - 1) // 2
+        return slice(start, start + long)
+    if mode == "valid":
+        return slice(short - 1, long)
+    raise ValueError(f"Unknown mode {mode!r}, expected 'full', 'same' or 'valid'")
+
+
+def choose_method(n, m):
+    long, short = max(n, m), min(n, m)
+    if long*short <= DIRECT_MAX_OPS or short <= DIRECT_MAX_KERNEL:
+        return "direct"
+    if long >= OVERLAP_ADD_MIN_RATIO*short:
+        return "overlap_add"
+    return "fft"
+
+
+class Convolver:
+    # Convolves real signals with one fixed kernel. The kernel's spectrum is
+    # kept for each FFT size used, so repeated calls only transform the signal.
+    def __init__(self, kernel):
+        self.kernel = np.asarray(kernel, dtype=float)
+        self.spectra = {}
+
+    def get_spectrum(self, n_fft):
+        if n_fft not in self.spectra:
+            self.spectra[n_fft] = rfft(self.kernel, n_fft)
+        return self.spectra[n_fft]
+
+    def convolve(self, signal, mode="full", method="auto"):
+        signal = np.asarray(signal, dtype=float)
+        n, m = len(signal), len(self.kernel)
+        if method == "auto":
+            method = choose_method(n, m)
+
+        if method == "direct":
+            full = np.convolve(signal, self.kernel)
+        elif method == "fft":
+            full = self.fft_convolve(signal)
+        elif method == "overlap_add":
+            full = self.overlap_add_convolve(signal)
+        else:
+            raise ValueError(f"Unknown method {method!r}")
+        return full[get_mode_slice(n, m, mode)]
+
+    def fft_convolve(self, signal):
+        n_full = len(signal) + len(self.kernel) - 1
+        n_fft = next_fast_len(n_full, real=True)
+        return irfft(rfft(signal, n_fft)*self.get_spectrum(n_fft), n_fft)[:n_full]
+
+    def overlap_add_convolve(self, signal):
+        n, m = len(signal), len(self.kernel)
+        n_fft = next_fast_len(OVERLAP_ADD_BLOCK_RATIO*m, real=True)
+        block = n_fft - m + 1
+        n_blocks = -(-n // block)
+
+        # Transform every block in one batched call
+        blocks = np.zeros((n_blocks, block))
+        blocks.ravel()[:n] = signal
+        pieces = irfft(rfft(blocks, n_fft, axis=1)*self.get_spectrum(n_fft), n_fft, axis=1)
+
+        # Each piece spans block + m - 1 samples, overlapping the next by
+        # m - 1 < block, so heads and tails can be summed as two flat arrays
+        result = np.zeros((n_blocks + 1)*block)
+        result[:n_blocks*block] = pieces[:, :block].ravel()
+        tails = np.zeros((n_blocks, block))
+        tails[:, :m - 1] = pieces[:, block:block + m - 1]
+        result[block:] += tails.ravel()
+        return result[:n + m - 1]
+
+
+def convolve(a, b, mode="full", method="auto"):
+    # Drop-in for np.convolve on real input, with the shorter argument as kernel
+    if len(a) < len(b):
+        a, b = b, a
+    return Convolver(b).convolve(a, mode=mode, method=method)
+
+
+if __name__ == "__main__":
+    from timeit import timeit
+
+    rng = np.random.default_rng(0)
+
+    def time_call(func, min_time=0.2):
+        number = 1
+        while True:
+            elapsed = timeit(func, number=number)
+            if elapsed > min_time or number > 1000:
+                return elapsed/number
+            number *= 4
+
+    for mode in ["full", "same", "valid"]:
+        a, b = rng.normal(size=1000), rng.normal(size=77)
+        for method in ["direct", "fft", "overlap_add"]:
+            assert np.allclose(convolve(a, b, mode, method), np.convolve(a, b, mode))
+
+    print("Signal and kernel of equal length")
+    print(f"{'n':>8} {'direct':>10} {'fft':>10} {'auto picks':>12}")
+    for n in [100, 300, 1000, 3000, 10000, 30000, 100000]:
+        a, b = rng.normal(size=n), rng.normal(size=n)
+        times = [
+            time_call(lambda: convolve(a, b, "same", method))
+            for method in ["direct", "fft"]
+        ]
+        print(f"{n:>8} {times[0]*1e3:8.3f}ms {times[1]*1e3:8.3f}ms {choose_method(n, n):>12}")
+
+    n = 10**6
+    a = rng.normal(size=n)
+    print(f"\nSignal of {n} samples against kernels of length m")
+    print(f"{'m':>8} {'direct':>10} {'fft':>10} {'overlap_add':>12} {'auto picks':>12}")
+    for m in [16, 64, 128, 256, 1024, 4096, 16384, 65536]:
+        b = rng.normal(size=m)
+        convolver = Convolver(b)
+        times = [
+            time_call(lambda: convolver.convolve(a, "same", method))
+            if method != "direct" or n*m <= 1.5e8 else np.nan
+            for method in ["direct", "fft", "overlap_add"]
+        ]
+        print(
+            f"{m:>8} {times[0]*1e3:8.2f}ms {times[1]*1e3:8.2f}ms {times[2]*1e3:10.2f}ms"
+            f" {choose_method(n, m):>12}"
+        )
@@ -1,19 +1,19 @@
 from manimlib import *
 import numpy as np
 
-class FourierDecomposition(InteractiveScene):
+from audio_spectrum import PartialStream, StreamingSTFT
+from derived import DerivedValue, add_dependent_updater, add_derived_updater
+from epicycles import Epicycles, sample_mobject_path
+from harmonic_bank import HarmonicBank
+from static_frames import StaticFrameReuse
+
+class FourierDecomposition(StaticFrameReuse, InteractiveScene):
 
     def construct(self):
         runtime1 = 3
         runtime2 = 9
         direction_multiplier = 1        # Usually 1
 
-        def get_wave(t, amplitudes, freqs):
-            wave = np.zeros_like(t)
-            for i,j in zip(amplitudes, freqs):
-                wave = wave + i*np.sin(2*PI*j*t)
-            return wave
-
         amplitudes = 0.25*np.array([1.920498251805278, 1.2562922502148286, 1.4494118404434762, 1.8975978980716324,
                                    1.0720430624138126, 1.9637169038603992, 0.32250155194042684])
         
@@ -23,6 +23,7 @@ class FourierDecomposition(InteractiveScene):
         colours = ["#C44227", "#C76E15", "#997A00", "#A3C47C", "#269940", "#1476B3", "#6A1FB3"]
 
         time = np.linspace(0,10,100)
+        bank = HarmonicBank(amplitudes, freqs, time, direction=direction_multiplier)
 
 
         t_tracker = ValueTracker(0)
@@ -33,10 +34,14 @@ class FourierDecomposition(InteractiveScene):
         t_label.fix_in_frame()
         t_val = t_label.make_number_changeable("0.00")
         t_val.fix_in_frame()
-        t_val.add_updater(lambda n: n.set_value(get_t()))
+        add_dependent_updater(t_val, lambda n: n.set_value(get_t()), t_tracker)
 
         self.add(t_label)
 
+        # Every sinusoid at the current time, shared by the wave and component updaters
+        component_values = DerivedValue(bank.get_components, t_tracker)
+        wave_values = DerivedValue(lambda values: values.sum(0), component_values)
+
 
         ax = ThreeDAxes(
             x_range=(-3,3,1),
@@ -48,7 +53,7 @@ class FourierDecomposition(InteractiveScene):
 
         self.add(ax)
 
-        wave_vals = get_wave(time, amplitudes, freqs)
+        wave_vals = bank.get_wave(0)
 
         wave = VMobject()
         wave.set_points_smoothly(ax.c2p(np.zeros_like(time)-2, time, wave_vals))
@@ -58,35 +63,42 @@ class FourierDecomposition(InteractiveScene):
         self.wait()
         # self.play(ShowCreation(wave), run_time=2)
 
-        def wave_updater(curve):
-            wave_vals = get_wave(time + direction_multiplier*get_t(), amplitudes, freqs)
+        def wave_updater(curve, wave_vals):
             curve.set_points_smoothly(ax.c2p(np.zeros_like(time)-2, time, wave_vals))
 
-        wave.add_updater(wave_updater)
+        add_derived_updater(wave, wave_updater, wave_values)
 
         self.play(t_tracker.animate.set_value(runtime1), run_time=runtime1, rate_func=linear)
         self.wait()
 
-        wave_vals = get_wave(time, amplitudes, freqs)
-
         wave.clear_updaters()
 
 
+        def get_component_points(comp_vals):
+            # (components, samples, 3), all through one c2p call
+            n_comps = len(comp_vals)
+            return ax.c2p(
+                np.zeros(n_comps*len(time)), np.tile(time, n_comps), comp_vals.ravel()
+            ).reshape(n_comps, len(time), 3)
+
+        comp_vals = bank.get_components(get_t())
         components = VGroup()
-        for a,f,c in zip(amplitudes, freqs, colours):
+        for points,c in zip(get_component_points(comp_vals), colours):
             comp = VMobject()
-            comp.set_points_smoothly(ax.c2p(np.zeros_like(time), time, a*np.sin(2*PI*f*(time+direction_multiplier*get_t())))).set_color(c)
+            comp.set_points_smoothly(points).set_color(c)
             components.add(comp)
         components.arrange(RIGHT).shift([1.5,0,0])
 
+        # Arranged once; each frame reuses the resulting offsets
+        layout_offsets = np.array([
+            comp.get_points()[0] - points[0]
+            for comp,points in zip(components, get_component_points(comp_vals))
+        ])
 
-        def component_updater(components : VGroup):
-            for amp,freq,comp,col in zip(amplitudes, freqs, components, colours):
-                comp_val = amp*np.sin(2*PI*freq*(time+direction_multiplier*get_t()))
-                comp\
-                .set_points_smoothly(ax.c2p(np.zeros_like(time), time, comp_val))\
-                .set_color(col)
-            components.arrange(RIGHT).shift([1.5,0,0])
+        def component_updater(components : VGroup, comp_vals):
+            all_points = get_component_points(comp_vals) + layout_offsets[:, np.newaxis]
+            for points,comp in zip(all_points, components):
+                comp.set_points_smoothly(points)
         
         self.play(
                 TransformFromCopy(wave, components[0]),
@@ -101,8 +113,8 @@ class FourierDecomposition(InteractiveScene):
 
         self.add(components)
 
-        components.add_updater(component_updater)
-        wave.add_updater(wave_updater)
+        add_derived_updater(components, component_updater, component_values)
+        add_derived_updater(wave, wave_updater, wave_values)
 
         self.play(
                 self.frame.animate.reorient(53, 71, 0, (0.18, -1.77, 0.3), 7.07), 
@@ -111,3 +123,103 @@ class FourierDecomposition(InteractiveScene):
                 rate_func=linear
                 )
         self.play(t_tracker.animate.set_value(runtime1+runtime2+3), run_time=runtime2, rate_func=linear)
+
+
+class AudioFourierDecomposition(StaticFrameReuse, InteractiveScene):
+    # The same wave-and-components picture, driven by the strongest partials
+    # of a recording as it plays, streamed from disk window by window
+    audio_file = "extra_media/clack.wav"
+    n_partials = 7
+    # Partials above this are left out, as the curves can't show them
+    max_freq = 2000
+    # Audio plays back this many times slower than real time
+    slowdown = 20
+    # Hz to cycles per unit along the time axis
+    freq_scale = 1/1000
+
+    def construct(self):
+        stft = StreamingSTFT(self.audio_file, n_partials=self.n_partials, max_freq=self.max_freq)
+        stream = PartialStream(stft)
+        # One streaming pass for the loudest partial, to scale amplitudes to the axes
+        peak = max((amplitudes[0] for _, amplitudes, _ in stft.iter_partials()), default=0) or 1
+        duration = stft.n_samples/stft.sample_rate
+
+        colours = color_gradient(["#C44227", "#997A00", "#269940", "#1476B3", "#6A1FB3"], self.n_partials)
+        time = np.linspace(0,10,400)
+        bank = HarmonicBank(np.zeros(self.n_partials), np.zeros(self.n_partials), time)
+
+        t_tracker = ValueTracker(0)
+        get_t = t_tracker.get_value
+
+        def get_component_values(t):
+            # Each curve follows one of the stream's partial tracks, and its
+            # phase accumulates as the track's frequency changes
+            amplitudes, freqs = stream.get_partials(t/self.slowdown)
+            bank.glide_to(amplitudes/peak, self.freq_scale*freqs, t)
+            return bank.get_components(t)
+
+        component_values = DerivedValue(get_component_values, t_tracker)
+        wave_values = DerivedValue(lambda values: values.sum(0), component_values)
+
+        t_label = Tex("t = 0.00").scale(1.2)
+        t_label.to_corner(UR)
+        t_label.fix_in_frame()
+        t_val = t_label.make_number_changeable("0.00")
+        t_val.fix_in_frame()
+        add_dependent_updater(t_val, lambda n: n.set_value(get_t()/self.slowdown), t_tracker)
+        self.add(t_label)
+
+        ax = ThreeDAxes(
+            x_range=(-3,3,1),
+            y_range=(0,10,1),
+            z_range=(-3,3,1)
+        )
+        self.frame.reorient(53, 71, 0, (0.18, -1.77, 0.3), 7.07)
+        self.add(ax)
+
+        # Same spacing components.arrange(RIGHT).shift([1.5,0,0]) gives
+        comp_xs = 1.5 + DEFAULT_MOBJECT_TO_MOBJECT_BUFF*(np.arange(self.n_partials) - (self.n_partials - 1)/2)
+
+        def get_points(xs, values):
+            n_curves = len(values)
+            return ax.c2p(
+                np.repeat(xs, len(time)), np.tile(time, n_curves), values.ravel()
+            ).reshape(n_curves, len(time), 3)
+
+        wave = VMobject()
+        components = VGroup(*(VMobject().set_stroke(c) for c in colours))
+        add_derived_updater(
+            wave,
+            lambda curve, wave_vals: curve.set_points_smoothly(get_points([-2], wave_vals[np.newaxis])[0]),
+            wave_values
+        )
+
+        def component_updater(components, comp_vals):
+            for points,comp in zip(get_points(comp_xs, comp_vals), components):
+                comp.set_points_smoothly(points)
+
+        add_derived_updater(components, component_updater, component_values)
+        self.add(wave, components)
+
+        self.play(
+            t_tracker.animate.set_value(duration*self.slowdown),
+            run_time=duration*self.slowdown,
+            rate_func=linear
+        )
+        self.wait()
+
+
+class EpicycleDrawing(InteractiveScene):
+    # A glyph's outline redrawn by its Fourier series, one phasor per term
+    n_terms = 2000
+    n_samples = 4096
+
+    def construct(self):
+        glyph = Tex(R"\pi").set_height(5)[0]
+        epicycles = Epicycles(sample_mobject_path(glyph, self.n_samples), n_terms=self.n_terms)
+        target = epicycles.get_traced_path(stroke_color=GREY_B, stroke_width=1, stroke_opacity=0.3)
+        trace = TracedPath(epicycles.get_tip_point, stroke_color=YELLOW, stroke_width=3)
+
+        self.add(target, epicycles, trace)
+        epicycles.add_updater(lambda m, dt: m.advance(dt))
+        self.wait(1/epicycles.time_scale)
@@ -0,0 +1,307 @@
+from manimlib import *
+import numpy as np
+
+from colormaps import set_color_by_values
+
+
+# A surface read straight from (rows, cols) coordinate arrays, such as those
+# from np.meshgrid. The arrays go through the axes as one affine map written
+# into the vertex buffer, and the du/dv points the shader takes its normals
+# from come from central differences on the grid, so nothing is evaluated
+# per point in Python. Affine moves of the surface (shift, rotate, scale,
+# directly or through a parent) are folded into that map, so new heights
+# from set_z keep the surface where it was put.
+
+
+def get_affine_coordinate_map(axes=None):
+    # (matrix, offset) with axes.c2p(x, y, z) == matrix @ (x, y, z) + offset,
+    # which holds for the linear number lines of Axes and ThreeDAxes
+    if axes is None:
+        return np.identity(3), np.zeros(3)
+    offset = np.array(axes.c2p(0, 0, 0), dtype=float)
+    matrix = np.array([axes.c2p(*basis) for basis in np.identity(3)], dtype=float).T - offset[:, np.newaxis]
+    return matrix, offset
+
+
+class GridSurface(Surface):
+    def __init__(
+        self,
+        x_values,
+        y_values,
+        z_values,
+        axes=None,
+        # Length of the du and dv offsets; normals only need their direction
+        tangent_length : float = 1e-3,
+        colormap=None,
+        vmin=None,
+        vmax=None,
+        **kwargs
+    ):
+        self.matrix, self.offset = get_affine_coordinate_map(axes)
+        self.tangent_length = tangent_length
+        self.set_colormap(colormap, vmin, vmax)
+        self.grid_values = (x_values, y_values, z_values)
+        shape = np.shape(z_values)
+        super().__init__(
+            u_range=(0, shape[0] - 1),
+            v_range=(0, shape[1] - 1),
+            resolution=shape,
+            **kwargs
+        )
+        del self.grid_values
+
+    def init_points(self):
+        # Allocated directly: resize_points goes through np.resize, which is
+        # very slow for structured arrays of a million vertices
+        self.data = np.zeros(self.resolution[0]*self.resolution[1], dtype=self.data.dtype)
+        self.set_grid(*self.grid_values)
+
+    def set_grid(self, x_values, y_values, z_values):
+        # Rewrite the surface from new (rows, cols) arrays of the same shape.
+        # x_values and y_values may also be 1d arrays along the columns and
+        # rows, which spares building full meshgrids.
+        x_values, y_values, z_values = np.broadcast_arrays(
+            *self.get_grid_axes(x_values, y_values), z_values
+        )
+        if z_values.shape != tuple(self.resolution):
+            raise ValueError(f"Expected a grid of shape {tuple(self.resolution)}, got {z_values.shape}")
+
+        # The part of each point and tangent that comes from x and y is kept,
+        # so set_z only has to add on the z terms
+        n_rows, n_cols = self.resolution
+        xy_points = np.zeros((n_rows, n_cols, 3))
+        for k in range(3):
+            xy_points[:, :, k] = self.offset[k] + self.matrix[k, 0]*x_values + self.matrix[k, 1]*y_values
+        self.xy_points = xy_points.reshape(-1, 3)
+        self.set_xy_tangents([np.gradient(xy_points, axis=axis).reshape(-1, 3) for axis in range(2)])
+        self.data["point"][:] = self.xy_points
+        return self.write_z(z_values)
+
+    def set_xy_tangents(self, tangents_list):
+        # Each with its squared lengths and dot products with the z direction
+        z_direction = self.matrix[:, 2]
+        self.xy_tangents = [
+            (tangents, (tangents*tangents).sum(1), tangents @ z_direction)
+            for tangents in tangents_list
+        ]
+
+    def get_grid_axes(self, x_values, y_values):
+        x_values, y_values = np.asarray(x_values), np.asarray(y_values)
+        if x_values.ndim == 1:
+            x_values = x_values[np.newaxis, :]
+        if y_values.ndim == 1:
+            y_values = y_values[:, np.newaxis]
+        return x_values, y_values
+
+    def apply_points_function(self, func, about_point=None, about_edge=ORIGIN, works_on_bounding_box=False):
+        # shift, scale, rotate and the like are affine, so they are folded
+        # into the grid's own map and later heights land where they should
+        if not hasattr(self, "z_values"):
+            return super().apply_points_function(func, about_point, about_edge, works_on_bounding_box)
+        if about_point is None and about_edge is not None:
+            about_point = self.get_bounding_box_point(about_edge)
+        if about_point is None:
+            about_point = ORIGIN
+        frame = np.vstack([ORIGIN, np.identity(3)])
+        images = func(frame) + about_point
+        offset = images[0] - about_point
+        matrix = (images[1:] - images[0]).T
+        # Anything else would leave no map for set_z to write through, so it
+        # is turned down before the points change
+        samples = self.data["point"][self.get_placement_samples()] - about_point
+        if not np.allclose(func(samples.copy()), samples @ matrix.T + offset, atol=1e-4):
+            raise ValueError("GridSurface can only be moved by affine functions, which set_z can follow")
+        super().apply_points_function(func, about_point, about_edge, works_on_bounding_box)
+        return self.fold_transform(matrix, about_point - matrix @ about_point + offset)
+
+    def fold_transform(self, matrix, offset):
+        # The grid was moved by p -> matrix @ p + offset
+        self.matrix = matrix @ self.matrix
+        self.offset = matrix @ self.offset + offset
+        self.xy_points = self.xy_points @ matrix.T + offset
+        self.set_xy_tangents([tangents @ matrix.T for tangents, _, _ in self.xy_tangents])
+        return self
+
+    def get_placement_samples(self):
+        # A spread of vertices to tell whether the surface was moved
+        return np.linspace(0, self.get_num_points() - 1, min(self.get_num_points(), 64)).astype(int)
+
+    def sync_placement(self):
+        # Moves made through a parent group don't pass through this
+        # surface's apply_points_function, so compare a few vertices with
+        # where the grid last put them and fit any affine change
+        samples = self.get_placement_samples()
+        expected = self.xy_points[samples] + np.outer(self.z_values.ravel()[samples], self.matrix[:, 2])
+        actual = self.data["point"][samples]
+        if np.allclose(actual, expected, atol=1e-4):
+            return self
+        shift = (actual - expected).mean(0)
+        if np.allclose(actual, expected + shift, atol=1e-4):
+            return self.fold_transform(np.identity(3), shift)
+
+        # Fit the map on the axes the samples span. A flat surface, such as
+        # a wave at rest, only pins down the two within its plane; the third
+        # is taken as their cross product, at their mean length, which is
+        # exact for rotations and uniform scaling.
+        center = expected.mean(0)
+        _, singular_values, basis = np.linalg.svd(expected - center)
+        n_axes = 2 if singular_values[2] < 1e-6*singular_values[0] else 3
+        local = np.hstack([(expected - center) @ basis[:n_axes].T, np.ones((len(samples), 1))])
+        solution, _, rank, _ = np.linalg.lstsq(local, actual, rcond=None)
+        if rank < n_axes + 1 or not np.allclose(local @ solution, actual, atol=1e-4):
+            raise ValueError("GridSurface was moved by a non-affine function, which set_z can't follow")
+        images = solution[:n_axes]
+        if n_axes == 2:
+            normal = np.cross(images[0], images[1])
+            images = np.vstack([images, normal/np.sqrt(max(get_norm(normal), 1e-12))])
+        matrix = images.T @ basis
+        return self.fold_transform(matrix, solution[-1] - matrix @ center)
+
+    def set_z(self, z_values):
+        # New heights over the same x and y, written into the existing point,
+        # du_point, dv_point and (with a colormap) rgba buffers
+        self.sync_placement()
+        return self.write_z(z_values)
+
+    def write_z(self, z_values):
+        z_values = np.asarray(z_values, dtype=float)
+        if z_values.shape != tuple(self.resolution):
+            raise ValueError(f"Expected a grid of shape {tuple(self.resolution)}, got {z_values.shape}")
+        z_direction = self.matrix[:, 2]
+        z_flat = z_values.ravel()
+
+        # Only the coordinates z maps onto change; for ThreeDAxes that is
+        # just the third
+        points = self.data["point"]
+        for k in np.flatnonzero(z_direction):
+            points[:, k] = self.xy_points[:, k] + z_direction[k]*z_flat
+
+        # Tangents are the x and y part plus dz*z_direction, with their
+        # lengths from the dot products kept in set_xy_tangents
+        z_direction_sq = z_direction @ z_direction
+        for key, axis, (tangents, tangents_sq, tangents_dot_z) in zip(
+            ["du_point", "dv_point"], [0, 1], self.xy_tangents
+        ):
+            dz = np.gradient(z_values, axis=axis).ravel()
+            lengths_sq = tangents_sq + dz*(2*tangents_dot_z + dz*z_direction_sq)
+            scale = self.tangent_length/np.sqrt(np.maximum(lengths_sq, 1e-24))
+            nudged = self.data[key]
+            for k in range(3):
+                nudged[:, k] = points[:, k] + (tangents[:, k] + dz*z_direction[k])*scale
+
+        self.z_values = z_values
+        self.refresh_colors()
+        self.note_changed_data()
+        self.refresh_bounding_box()
+        return self
+
+    def init_colors(self):
+        super().init_colors()
+        self.refresh_colors()
+
+    def set_colormap(self, colormap, vmin=None, vmax=None):
+        # Colors by z (in the grid's own units) from now on, on every set_z
+        self.colormap = colormap
+        self.vmin = vmin
+        self.vmax = vmax
+        return self.refresh_colors()
+
+    def refresh_colors(self):
+        if self.colormap is not None and hasattr(self, "z_values"):
+            set_color_by_values(self, self.z_values, self.colormap, self.vmin, self.vmax, keys=["rgba"])
+        return self
+
+    def get_shader_data(self):
+        # Same as data[triangle_indices], which is what the renderer reads in
+        # every frame the data changed, but with the vertices gathered as raw
+        # records into a buffer kept between frames. Indexing the structured
+        # array directly is about three times slower on large grids.
+        indices = self.get_shader_vert_indices()
+        buffer = getattr(self, "shader_data_buffer", None)
+        if buffer is None or buffer.dtype != self.data.dtype or len(buffer) != len(indices):
+            buffer = self.shader_data_buffer = np.zeros(len(indices), dtype=self.data.dtype)
+        record = np.dtype((np.void, self.data.dtype.itemsize))
+        np.take(self.data.view(record), indices, out=buffer.view(record))
+        return buffer
+
+    def get_grid_points(self):
+        # The vertex buffer as a (rows, cols, 3) view
+        return self.data["point"].reshape((*self.resolution, 3))
+
+
+class TimeVaryingSurface(GridSurface):
+    # Heights from a vectorized func(x, y, t) over a fixed grid, such as a
+    # ripple or a heat equation solution. Moving to a new time re-evaluates
+    # func once over the whole grid and rewrites the existing buffers.
+    #
+    #     surface.add_updater(lambda m, dt: m.advance(dt))
+    def __init__(
+        self,
+        func,
+        x_values,
+        y_values,
+        t : float = 0.0,
+        time_scale : float = 1.0,
+        **kwargs
+    ):
+        self.func = func
+        self.time = t
+        self.time_scale = time_scale
+        self.x_grid, self.y_grid = np.broadcast_arrays(*self.get_grid_axes(x_values, y_values))
+        super().__init__(self.x_grid, self.y_grid, self.get_z_values(t), **kwargs)
+
+    def get_z_values(self, t):
+        return self.func(self.x_grid, self.y_grid, t)
+
+    def set_time(self, t):
+        self.time = t
+        return self.set_z(self.get_z_values(t))
+
+    def advance(self, dt):
+        return self.set_time(self.time + self.time_scale*dt)
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    axes = ThreeDAxes()
+    for n in [60, 300, 1000]:
+        x = np.linspace(-3, 3, n)
+        X, Y = np.meshgrid(x, x)
+        Z = 5*np.sin(X**2 + Y**2)/(X**2 + Y**2 + 1)
+
+        start = perf_counter()
+        surface = GridSurface(X, Y, Z, axes=axes)
+        grid_time = perf_counter() - start
+        assert np.allclose(surface.get_points(), axes.c2p(X.ravel(), Y.ravel(), Z.ravel()), atol=1e-5)
+        message = f"{n:>4}x{n:<4}: GridSurface {grid_time*1e3:8.1f} ms"
+
+        if n <= 300:
+            # What plot_surface.py used to do
+            def param_surface(u, v):
+                i = min(int(u*(n - 1)), n - 1)
+                j = min(int(v*(n - 1)), n - 1)
+                return axes.c2p(X[i, j], Y[i, j], Z[i, j])
+
+            start = perf_counter()
+            old = ParametricSurface(param_surface, u_range=[0, 1], v_range=[0, 1], resolution=(n, n))
+            old_time = perf_counter() - start
+            message += f", ParametricSurface {old_time*1e3:8.1f} ms ({old_time/grid_time:.0f}x)"
+        print(message)
+
+    # Frame rate of an evolving ripple: func evaluation, the in-place buffer
+    # updates, and what the renderer asks of the surface on the CPU side
+    def ripple(x, y, t):
+        r = np.sqrt(x*x + y*y)
+        return np.sin(3*r - 2*t)/(1 + r)
+
+    for n in [200, 500]:
+        x = np.linspace(-3, 3, n)
+        surface = TimeVaryingSurface(ripple, x, x, axes=axes, colormap="viridis", vmin=-1, vmax=1)
+        n_frames = 30
+        start = perf_counter()
+        for _ in range(n_frames):
+            surface.advance(1/30)
+            surface.get_shader_data()
+        elapsed = perf_counter() - start
+        print(f"{n}x{n} ripple: {elapsed/n_frames*1e3:6.1f} ms/frame ({n_frames/elapsed:5.1f} fps)")
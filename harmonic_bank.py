@@ -0,0 +1,93 @@
+import numpy as np
+
+
+class HarmonicBank:
+    # A sum of sinusoids a_k*sin(2*pi*f_k*(x + t)) sampled on a fixed grid x.
+    # The components at t = 0 are kept as complex phasors, so moving to time t
+    # is a rotation by e^(2*pi*i*f_k*t): one complex exponential per component
+    # and a multiply-add per sample, with no sin over the whole grid per frame.
+    #
+    # Partials that change over time go through glide_to, which keeps each
+    # component's phase as the integral of its angular frequency, so a change
+    # of frequency bends the curve instead of making it jump.
+    def __init__(self, amplitudes, freqs, samples, direction=1):
+        self.samples = np.asarray(samples, dtype=float)
+        self.direction = direction
+        # Each component's phase at phase_time, on top of omega*x
+        self.phases = np.zeros(len(freqs))
+        self.phase_time = 0.0
+        self.set_partials(amplitudes, freqs)
+
+    def set_partials(self, amplitudes, freqs):
+        # For partials that change over time, e.g. from audio
+        self.amplitudes = np.asarray(amplitudes, dtype=float)
+        self.freqs = np.asarray(freqs, dtype=float)
+        self.omegas = 2*np.pi*self.freqs
+        # (components, samples), split into parts for real-valued arithmetic
+        phasors = self.amplitudes[:, np.newaxis]*np.exp(1j*np.outer(self.omegas, self.samples))
+        self.phasors_real = np.ascontiguousarray(phasors.real)
+        self.phasors_imag = np.ascontiguousarray(phasors.imag)
+        self.buffer = np.zeros_like(self.phasors_real)
+        return self
+
+    def glide_to(self, amplitudes, freqs, t):
+        # New partials at time t, with the phases carried over from the last
+        # call by the trapezoidal rule on the old and new frequencies
+        new_omegas = 2*np.pi*np.asarray(freqs, dtype=float)
+        if len(new_omegas) == len(self.omegas):
+            self.phases = self.phases + 0.5*(self.omegas + new_omegas)*self.direction*(t - self.phase_time)
+        else:
+            self.phases = new_omegas*self.direction*t
+        self.phase_time = t
+        return self.set_partials(amplitudes, freqs)
+
+    def get_rotation(self, t):
+        angles = self.phases + self.omegas*(self.direction*(t - self.phase_time))
+        return np.cos(angles), np.sin(angles)
+
+    def get_components(self, t=0, out=None):
+        # Im(phasor*e^(i*angle)) = imag*cos(angle) + real*sin(angle), row by row
+        cos, sin = self.get_rotation(t)
+        if out is None:
+            out = np.empty_like(self.phasors_real)
+        np.multiply(self.phasors_imag, cos[:, np.newaxis], out=out)
+        np.multiply(self.phasors_real, sin[:, np.newaxis], out=self.buffer)
+        out += self.buffer
+        return out
+
+    def get_wave(self, t=0):
+        # The row sum of get_components(t), as two matrix-vector products
+        cos, sin = self.get_rotation(t)
+        return cos @ self.phasors_imag + sin @ self.phasors_real
+
+
+if __name__ == "__main__":
+    from timeit import timeit
+
+    rng = np.random.default_rng(0)
+    samples = np.linspace(0, 10, 100)
+    for n_components in [7, 100, 1000]:
+        amplitudes = rng.uniform(0.1, 0.5, n_components)
+        freqs = rng.uniform(0.1, 2, n_components)
+        bank = HarmonicBank(amplitudes, freqs, samples)
+
+        def per_component_loop(t=1.3):
+            wave = np.zeros_like(samples)
+            components = []
+            for a, f in zip(amplitudes, freqs):
+                component = a*np.sin(2*np.pi*f*(samples + t))
+                components.append(component)
+                wave = wave + component
+            return components, wave
+
+        components, wave = per_component_loop()
+        assert np.allclose(bank.get_components(1.3), components)
+        assert np.allclose(bank.get_wave(1.3), wave)
+
+        out = np.empty((n_components, len(samples)))
+        loop_time = timeit(per_component_loop, number=200)/200
+        bank_time = timeit(lambda: (bank.get_components(1.3, out=out), bank.get_wave(1.3)), number=200)/200
+        print(
+            f"{n_components:>5} components: loop {loop_time*1e3:7.3f} ms, "
+            f"bank {bank_time*1e3:6.3f} ms ({loop_time/bank_time:4.0f}x)"
+        )
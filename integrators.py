@@ -0,0 +1,251 @@
+import numpy as np
+
+
+# Right-hand sides map (t, state) -> d(state)/dt. The state has shape (2, ...),
+# so the same function advances a single state (2,) or a batch of states (2, N).
+class RHS:
+    def __call__(self, t, state):
+        raise NotImplementedError
+
+    def field(self, coords_array):
+        # (N, 2) -> (N, 2) form expected by VectorField
+        return self(0, coords_array.T).T
+
+    def get_key(self):
+        # Everything that identifies the dynamics, used to key cached trajectories
+        return (type(self).__name__, tuple(sorted(vars(self).items())))
+
+
+class PendulumRHS(RHS):
+    def __init__(self, g=9.81, l=1.0):
+        self.g = g
+        self.l = l
+
+    def __call__(self, t, state):
+        return np.array([state[1], -(self.g/self.l)*np.sin(state[0])])
+
+
+class DampedPendulumRHS(RHS):
+    def __init__(self, g=9.81, l=1.0, damping=0.5):
+        self.g = g
+        self.l = l
+        self.damping = damping
+
+    def __call__(self, t, state):
+        return np.array([
+            state[1],
+            -(self.g/self.l)*np.sin(state[0]) - self.damping*state[1]
+        ])
+
+
+class DrivenPendulumRHS(RHS):
+    def __init__(self, g=9.81, l=1.0, damping=0.5, drive_amplitude=1.2, drive_freq=2/3):
+        self.g = g
+        self.l = l
+        self.damping = damping
+        self.drive_amplitude = drive_amplitude
+        self.drive_freq = drive_freq
+
+    def __call__(self, t, state):
+        return np.array([
+            state[1],
+            -(self.g/self.l)*np.sin(state[0]) - self.damping*state[1]
+            + self.drive_amplitude*np.cos(self.drive_freq*t)
+        ])
+
+
+class HarmonicOscillatorRHS(RHS):
+    def __init__(self, omega=1.0):
+        self.omega = omega
+
+    def __call__(self, t, state):
+        return np.array([state[1], -self.omega**2 * state[0]])
+
+
+class DuffingRHS(RHS):
+    def __init__(self, alpha=-1.0, beta=1.0, damping=0.0):
+        self.alpha = alpha
+        self.beta = beta
+        self.damping = damping
+
+    def __call__(self, t, state):
+        x, v = state[0], state[1]
+        return np.array([v, -self.damping*v - self.alpha*x - self.beta*x**3])
+
+
+# Fixed-step schemes
+def euler_step(rhs, t, y, dt):
+    return y + dt*rhs(t, y)
+
+
+def rk4_step(rhs, t, y, dt):
+    k1 = rhs(t, y)
+    k2 = rhs(t + dt/2, y + (dt/2)*k1)
+    k3 = rhs(t + dt/2, y + (dt/2)*k2)
+    k4 = rhs(t + dt, y + dt*k3)
+    return y + (dt/6)*(k1 + 2*k2 + 2*k3 + k4)
+
+
+def leapfrog_step(rhs, t, y, dt):
+    # Kick-drift-kick (velocity Verlet). Symplectic when the state is (q, p)
+    # with dq/dt = p and dp/dt depending on t and q only, as for the pendulum.
+    q, p = y[0], y[1]
+    p_half = p + (dt/2)*rhs(t, y)[1]
+    q_new = q + dt*p_half
+    p_new = p_half + (dt/2)*rhs(t + dt, np.array([q_new, p_half]))[1]
+    return np.array([q_new, p_new])
+
+
+STEPPERS = {
+    "euler": euler_step,
+    "rk4": rk4_step,
+    "leapfrog": leapfrog_step,
+    "verlet": leapfrog_step,
+}
+
+
+# Dormand-Prince 5(4) tableau
+DP_C = np.array([0, 1/5, 3/10, 4/5, 8/9, 1, 1])
+DP_A = [
+    [],
+    [1/5],
+    [3/40, 9/40],
+    [44/45, -56/15, 32/9],
+    [19372/6561, -25360/2187, 64448/6561, -212/729],
+    [9017/3168, -355/33, 46732/5247, 49/176, -5103/18656],
+    [35/384, 0, 500/1113, 125/192, -2187/6784, 11/84],
+]
+DP_B = np.array([35/384, 0, 500/1113, 125/192, -2187/6784, 11/84, 0])
+DP_B_LOW = np.array([5179/57600, 0, 7571/16695, 393/640, -92097/339200, 187/2100, 1/40])
+
+
+def _dormand_prince_step(rhs, t, y, h, f0):
+    ks = [f0]
+    for c, a in zip(DP_C[1:], DP_A[1:]):
+        y_stage = y + h*sum(a_i*k for a_i, k in zip(a, ks) if a_i != 0)
+        ks.append(rhs(t + c*h, y_stage))
+    # The last stage is evaluated at the 5th order solution (FSAL)
+    y_new = y + h*sum(b*k for b, k in zip(DP_B, ks) if b != 0)
+    err = h*sum((b - b_low)*k for b, b_low, k in zip(DP_B, DP_B_LOW, ks))
+    return y_new, ks[-1], err
+
+
+def _integrate_adaptive(rhs, y, dt, n_steps, out, rtol, atol, max_step=None):
+    # Steps are sized by error control, and the uniform dt output grid is
+    # filled in by cubic Hermite interpolation within each accepted step
+    t_end = n_steps*dt
+    out[..., 0] = y
+    next_k = 1
+    t = 0.0
+    h = dt
+    f = rhs(t, y)
+    while next_k <= n_steps:
+        if max_step is not None:
+            h = min(h, max_step)
+        h = min(h, t_end - t)
+        y_new, f_new, err = _dormand_prince_step(rhs, t, y, h, f)
+        scale = atol + rtol*np.maximum(np.abs(y), np.abs(y_new))
+        err_norm = np.sqrt(np.mean((err/scale)**2))
+
+        if err_norm <= 1 or h <= 1e-12:
+            t_new = t + h
+            last_k = n_steps if t_new >= t_end else min(int(np.floor(t_new/dt + 1e-9)), n_steps)
+            if last_k >= next_k:
+                s = (np.arange(next_k, last_k + 1)*dt - t)/h
+                s2, s3 = s**2, s**3
+                h00 = 2*s3 - 3*s2 + 1
+                h10 = s3 - 2*s2 + s
+                h01 = -2*s3 + 3*s2
+                h11 = s3 - s2
+                out[..., next_k:last_k + 1] = (
+                    np.multiply.outer(y, h00) + np.multiply.outer(h*f, h10)
+                    + np.multiply.outer(y_new, h01) + np.multiply.outer(h*f_new, h11)
+                )
+                next_k = last_k + 1
+            t, y, f = t_new, y_new, f_new
+
+        factor = 5.0 if err_norm == 0 else 0.9*err_norm**(-1/5)
+        h *= min(5.0, max(0.2, factor))
+    return out
+
+
+def integrate(rhs, init_state, time=5, dt=0.01, method="rk4", out=None, rtol=1e-6, atol=1e-9):
+    # Returns the states at t = 0, dt, ..., time as a contiguous (2, n) array
+    # (or (2, ..., n) for batched states) that axes.c2p(*result) accepts directly
+    n_steps = int(round(time/dt))
+    y = np.array(init_state, dtype=float)
+    if out is None:
+        out = np.empty((*y.shape, n_steps + 1))
+
+    if method == "adaptive":
+        return _integrate_adaptive(rhs, y, dt, n_steps, out, rtol, atol)
+
+    step = STEPPERS[method]
+    out[..., 0] = y
+    for k in range(1, n_steps + 1):
+        y = step(rhs, (k - 1)*dt, y, dt)
+        out[..., k] = y
+    return out
+
+
+def integrate_ensemble(rhs, init_states, time=5, dt=0.01, method="rk4", rtol=1e-6, atol=1e-9):
+    # Advances all N initial states (N, 2) together, one array operation per
+    # step, and returns their trajectories as a contiguous (N, 2, T) array
+    init_states = np.asarray(init_states, dtype=float)
+    n_steps = int(round(time/dt))
+    out = np.empty((*init_states.shape, n_steps + 1))
+    # The integrator writes batched (2, N) states through a transposed view
+    integrate(
+        rhs, init_states.T, time=time, dt=dt, method=method,
+        out=out.transpose(1, 0, 2), rtol=rtol, atol=atol
+    )
+    return out
+
+
+if __name__ == "__main__":
+    import argparse
+    from time import perf_counter
+
+    parser = argparse.ArgumentParser(description="Compare integrators against the old np.append loop")
+    parser.add_argument("--time", type=float, default=10)
+    parser.add_argument("--dt", type=float, default=0.001)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--ensemble", type=int, default=2000)
+    args = parser.parse_args()
+
+    rhs = PendulumRHS(g=9.81, l=1.5)
+    init_state = [np.pi/4, 0]
+
+    def legacy_calculate_path(init_state, time, dt):
+        # The loop PendulumToPhasePlane.calculate_path used to run
+        state_array = np.array([init_state])
+        old_state = np.array(init_state)
+        for _ in range(int(round(time/dt))):
+            new_state = old_state + dt*rhs(0, old_state)
+            state_array = np.append(state_array, [new_state], axis=0)
+            old_state = new_state
+        return state_array.T
+
+    def best_of(func):
+        times = []
+        for _ in range(args.repeats):
+            start = perf_counter()
+            result = func()
+            times.append(perf_counter() - start)
+        return min(times), result
+
+    legacy_time, legacy = best_of(lambda: legacy_calculate_path(init_state, args.time, args.dt))
+    print(f"time={args.time}, dt={args.dt}, {legacy.shape[1]} samples")
+    print(f"{'legacy np.append':>18}: {legacy_time*1000:9.2f} ms")
+
+    for method in ["euler", "rk4", "leapfrog", "adaptive"]:
+        elapsed, path = best_of(lambda: integrate(rhs, init_state, args.time, args.dt, method=method))
+        # Energy drift is a cheap accuracy check for the pendulum
+        energy = 0.5*path[1]**2 - (rhs.g/rhs.l)*np.cos(path[0])
+        drift = np.max(np.abs(energy - energy[0]))
+        print(f"{method:>18}: {elapsed*1000:9.2f} ms  ({legacy_time/elapsed:6.1f}x)  energy drift {drift:.2e}")
+
+    init_states = np.random.default_rng(0).uniform([-8, -5], [8, 5], size=(args.ensemble, 2))
+    single_time, _ = best_of(lambda: integrate(rhs, init_state, args.time, args.dt))
+    ensemble_time, _ = best_of(lambda: integrate_ensemble(rhs, init_states, args.time, args.dt))
+    print(f"rk4 ensemble of {args.ensemble}: {ensemble_time*1000:9.2f} ms  ({ensemble_time/single_time:.1f}x one trajectory)")
@@ -0,0 +1,45 @@
+from manimlib import *
+import numpy as np
+
+
+# Level of detail for 3D mobjects. How finely a round primitive needs to be
+# tessellated depends on how many pixels it covers, which changes as the
+# camera frame moves. Mobjects keep a few cached resolution tiers, finest
+# first, and pick one per object from its projected size.
+#
+# A mobject opts in by defining update_level_of_detail(frame); Arrow3DField
+# does, per arrow. A tier switch rewrites the mobject's points, so it has to
+# rebuild them from where the mobject is now, moves included.
+#
+#     add_level_of_detail_updater(arrows, self.frame)
+
+
+def get_pixels_per_unit(frame, points, pixel_width=DEFAULT_PIXEL_WIDTH):
+    # Pixels spanned on screen by a unit length at each of an (N, 3) array of
+    # points, with the same perspective divide as emit_gl_Position.glsl.
+    # Points behind the camera get 0.
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    to_camera = frame.get_inverse_camera_rotation_matrix()[2]
+    depths = (points - frame.get_center()) @ to_camera
+    w = 1 - depths/frame.get_focal_distance()
+    pixels_per_unit = pixel_width/frame.get_width()
+    return np.where(w > 0, pixels_per_unit/np.where(w > 0, w, 1), 0)
+
+
+def choose_tiers(circumferences, tier_segments, pixels_per_segment=4):
+    # Coarsest tier with enough segments around each circumference (given in
+    # pixels), falling back on the finest. tier_segments is decreasing.
+    needed = np.asarray(circumferences)/pixels_per_segment
+    segments = np.asarray(tier_segments)
+    n_fine_enough = (segments[np.newaxis, :] >= needed[:, np.newaxis]).sum(1)
+    return np.maximum(n_fine_enough - 1, 0)
+
+
+def add_level_of_detail_updater(mobject, frame, pixel_width=DEFAULT_PIXEL_WIDTH):
+    # Updates every family member that supports it. They are left alone
+    # while animating, since an animation interpolates between fixed
+    # vertex counts.
+    for mob in mobject.get_family():
+        if hasattr(mob, "update_level_of_detail"):
+            mob.add_updater(lambda m: m._is_animating or m.update_level_of_detail(frame, pixel_width))
+    return mobject
@@ -0,0 +1,222 @@
+from manimlib import *
+import numpy as np
+
+
+# Variants of Arrow, Arc and Circle whose setters rewrite the existing point
+# buffer, for updaters that would otherwise become() a new mobject every frame.
+# MutableArrow assumes the arrow lies in the xy-plane.
+
+
+class MutableArrow(Arrow):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.point_buffer = np.zeros((15, 3))
+        self.last_unit_vect = normalize(self.get_end() - self.get_start(), fall_back=RIGHT)
+
+    def put_start_and_end_on(self, start, end):
+        if self.path_arc != 0 or self.get_num_points() != 15:
+            return super().put_start_and_end_on(start, end)
+
+        start = np.asarray(start, dtype=float)
+        vect = np.asarray(end, dtype=float) - start
+        length = get_norm(vect)
+        if length > 1e-8:
+            self.last_unit_vect = vect/length
+        else:
+            length = 1e-8
+        u = self.last_unit_vect
+        v = np.array([-u[1], u[0], 0.0])
+        width, tip_width, tip_length = self.get_key_dimensions(length)
+        shaft = length - tip_length
+
+        # Same anchor layout Arrow.set_points_by_ends produces, written along
+        # the arrow's own axes: the shaft, the tip, then back down the shaft
+        points = self.point_buffer
+        anchors = points[0::2]
+        anchors[:, 0] = [0, shaft, shaft, length, shaft, shaft, 0, 0]
+        anchors[:, 1] = np.array([-width, -width, -tip_width, 0, tip_width, width, width, -width])/2
+        points[1::2, :2] = 0.5*(anchors[:-1, :2] + anchors[1:, :2])
+        points[:, 2] = 0
+        points[:] = start + np.outer(points[:, 0], u) + np.outer(points[:, 1], v)
+        self.set_points(points)
+        self.tip_index = 6
+        return self
+
+    def set_angle(self, angle):
+        start = self.get_start()
+        length = get_norm(self.get_end() - start)
+        return self.put_start_and_end_on(start, start + length*np.array([np.cos(angle), np.sin(angle), 0]))
+
+    def set_length(self, length):
+        start = self.get_start()
+        unit_vect = normalize(self.get_end() - start, fall_back=self.last_unit_vect)
+        return self.put_start_and_end_on(start, start + length*unit_vect)
+
+
+class MutableArc(Arc):
+    # Keeps its defining parameters so the setters can redraw from them, which
+    # also works for a zero angle where the arc center can't be recovered.
+    # Moves made since the last redraw (shift, scale, rotate, directly or
+    # through a parent) are read back from the points first, so they stick.
+    def __init__(
+        self,
+        start_angle=0,
+        angle=TAU/4,
+        radius=1.0,
+        n_components=8,
+        arc_center=ORIGIN,
+        **kwargs
+    ):
+        self.start_angle = start_angle
+        self.arc_angle = angle
+        self.radius = radius
+        self.arc_center = np.array(arc_center, dtype=float)
+        # Where the arc's own x and y axes point
+        self.placement = np.array([RIGHT, UP])
+        n_points = 2*n_components + 1
+        self.unit_proportions = np.linspace(0, 1, n_points)
+        self.local_points = np.zeros((n_points, 2))
+        self.point_buffer = np.zeros((n_points, 3))
+        self.written_points = None
+        # Called on Arc directly, since Circle.__init__ sets the angle itself
+        Arc.__init__(
+            self,
+            start_angle=start_angle,
+            angle=angle,
+            radius=radius,
+            n_components=n_components,
+            arc_center=arc_center,
+            **kwargs
+        )
+        self.refresh_arc_points()
+
+    def sync_placement(self):
+        # Fit the affine change between the points as last drawn and as they
+        # are now, and fold it into the center, radius, start angle and axes
+        if self.written_points is None:
+            return self
+        current = self.get_points()
+        if current.shape != self.written_points.shape:
+            return self
+        if np.array_equal(current, self.written_points):
+            return self
+        local = np.hstack([self.local_points, np.ones((len(current), 1))])
+        solution, _, rank, _ = np.linalg.lstsq(local, current, rcond=None)
+        if rank < 3:
+            # A zero angle or radius only tells a shift
+            self.arc_center = self.arc_center + (current - self.written_points).mean(0)
+            return self
+        if not np.allclose(local @ solution, current, atol=1e-4):
+            # Not a move, such as a partial draw, so it's redrawn over
+            return self
+
+        axes, self.arc_center = solution[:2], solution[2]
+        scale = np.sqrt(get_norm(axes[0])*get_norm(axes[1]))
+        if scale < 1e-8:
+            return self
+        self.radius *= scale
+        axes = axes/scale
+        # A rotation within the xy-plane goes into the start angle
+        in_plane = axes[:, :2]
+        if np.allclose(axes[:, 2], 0, atol=1e-6) and np.allclose(in_plane @ in_plane.T, np.identity(2), atol=1e-6) \
+                and np.linalg.det(in_plane) > 0:
+            self.start_angle += np.arctan2(in_plane[0, 1], in_plane[0, 0])
+            axes = np.array([RIGHT, UP])
+        self.placement = axes
+        return self
+
+    def refresh_arc_points(self):
+        n_components = len(self.unit_proportions) // 2
+        angles = self.start_angle + self.arc_angle*self.unit_proportions
+        radii = np.full(len(angles), float(self.radius))
+        # Handles sit outside the circle, as in quadratic_bezier_points_for_arc
+        radii[1::2] /= np.cos(self.arc_angle/n_components/2)
+        local = self.local_points
+        local[:, 0] = radii*np.cos(angles)
+        local[:, 1] = radii*np.sin(angles)
+        points = self.point_buffer
+        np.dot(local, self.placement, out=points)
+        points += self.arc_center
+        self.set_points(points)
+        if self.written_points is None or self.written_points.shape != self.get_points().shape:
+            self.written_points = self.get_points().copy()
+        else:
+            self.written_points[:] = self.get_points()
+        return self
+
+    def set_angle(self, angle):
+        self.sync_placement()
+        self.arc_angle = angle
+        return self.refresh_arc_points()
+
+    def set_start_angle(self, start_angle):
+        self.sync_placement()
+        self.start_angle = start_angle
+        return self.refresh_arc_points()
+
+    def set_radius(self, radius):
+        self.sync_placement()
+        self.radius = radius
+        return self.refresh_arc_points()
+
+    def move_arc_center_to(self, point):
+        self.sync_placement()
+        self.arc_center = np.array(point, dtype=float)
+        return self.refresh_arc_points()
+
+
+class MutableCircle(MutableArc, Circle):
+    def __init__(self, start_angle=0, stroke_color=RED, **kwargs):
+        super().__init__(start_angle, TAU, stroke_color=stroke_color, **kwargs)
+
+    def get_radius(self):
+        return self.sync_placement().radius
+
+
+if __name__ == "__main__":
+    import tracemalloc
+    from time import perf_counter
+
+    n_frames = 300
+    angles = np.linspace(-PI/4, PI/4, n_frames)
+
+    def become_updaters():
+        arrow = Arrow(ORIGIN, RIGHT, buff=0, thickness=3, tip_width_ratio=3, max_width_to_length_ratio=0.05)
+        arc = Arc(radius=0.5, angle=PI/4, start_angle=-PI/2)
+        circle = Circle(radius=1)
+
+        def frame(angle):
+            end = -np.sin(angle)*np.array([np.cos(angle), np.sin(angle), 0])
+            arrow.become(Arrow(ORIGIN, end, buff=0, thickness=3, tip_width_ratio=3, max_width_to_length_ratio=0.05))
+            arc.become(Arc(radius=0.5, angle=angle, start_angle=-PI/2))
+            circle.become(Circle(radius=1 + angle))
+        return frame
+
+    def in_place_setters():
+        arrow = MutableArrow(ORIGIN, RIGHT, buff=0, thickness=3, tip_width_ratio=3, max_width_to_length_ratio=0.05)
+        arc = MutableArc(radius=0.5, angle=PI/4, start_angle=-PI/2)
+        circle = MutableCircle(radius=1)
+
+        def frame(angle):
+            end = -np.sin(angle)*np.array([np.cos(angle), np.sin(angle), 0])
+            arrow.put_start_and_end_on(ORIGIN, end)
+            arc.set_angle(angle)
+            circle.set_radius(1 + angle)
+        return frame
+
+    for name, make_frame in [("become()", become_updaters), ("in-place setters", in_place_setters)]:
+        frame = make_frame()
+        start = perf_counter()
+        for angle in angles:
+            frame(angle)
+        elapsed = perf_counter() - start
+
+        tracemalloc.start()
+        allocated = []
+        for angle in angles[:50]:
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            frame(angle)
+            allocated.append(tracemalloc.get_traced_memory()[1] - current)
+        tracemalloc.stop()
+        print(f"{name:>16}: {elapsed/n_frames*1e6:8.1f} us/frame, peak allocation {np.mean(allocated)/1024:7.1f} KiB/frame")
@@ -0,0 +1,134 @@
+from manimlib import *
+import numpy as np
+
+
+class ParticleFlow(VMobject):
+    # Particles streaming through a vector field. Positions live in one (N, 2)
+    # array of axes coordinates and are advected each frame by the same
+    # vectorized func a VectorField takes, (N, 2) -> (N, 2). Recent positions
+    # are kept in a ring buffer and drawn as fading tails, each particle being
+    # one subpath of this single VMobject.
+    def __init__(
+        self,
+        axes,
+        func,
+        n_particles : int = 10000,
+        tail_length : int = 8,
+        time_scale : float = 0.5,
+        max_lifetime : float = 4.0,
+        color=WHITE,
+        stroke_width : float = 1.0,
+        stroke_opacity : float = 0.8,
+        seed : int = 0,
+        **kwargs
+    ):
+        self.axes = axes
+        self.func = func
+        self.n_particles = n_particles
+        self.tail_length = tail_length
+        self.time_scale = time_scale
+        self.max_lifetime = max_lifetime
+        self.rng = np.random.default_rng(seed)
+
+        self.lower = np.array([axes.x_range[0], axes.y_range[0]])
+        self.upper = np.array([axes.x_range[1], axes.y_range[1]])
+        self.positions = self.get_random_positions(n_particles)
+        self.ages = self.rng.uniform(0, max_lifetime, n_particles)
+        # history[k] holds every particle's position k frames into the ring
+        self.history = np.repeat(self.positions[np.newaxis], tail_length, axis=0)
+        self.head = 0
+        self.anchor_buffer = np.zeros((n_particles, 2*tail_length, 3))
+
+        super().__init__(
+            color=color,
+            stroke_width=stroke_width,
+            stroke_opacity=stroke_opacity,
+            joint_type="no_joint",
+            **kwargs
+        )
+        self.refresh_flow_points()
+        # Fade each tail in from its oldest point
+        fade = np.linspace(0, 1, 2*tail_length)**2
+        self.data["stroke_rgba"][:, 3] = stroke_opacity*np.tile(fade, n_particles)[:-1]
+        self.add_updater(lambda m, dt: m.advect(dt))
+
+    def get_random_positions(self, n):
+        return self.rng.uniform(self.lower, self.upper, (n, 2))
+
+    def advect(self, dt):
+        if dt == 0:
+            return self
+        step = self.time_scale*dt
+        # Midpoint rule
+        midpoints = self.positions + (step/2)*self.func(self.positions)
+        self.positions += step*self.func(midpoints)
+        self.ages += dt
+
+        # Respawn particles that left the axes or outlived their lifetime, so
+        # they don't pile up around attracting regions
+        respawn = (
+            (self.positions < self.lower).any(1)
+            | (self.positions > self.upper).any(1)
+            | (self.ages > self.max_lifetime)
+        )
+        n_respawn = respawn.sum()
+        if n_respawn:
+            self.positions[respawn] = self.get_random_positions(n_respawn)
+            self.ages[respawn] = 0
+            self.history[:, respawn] = self.positions[respawn]
+
+        self.head = (self.head + 1) % self.tail_length
+        self.history[self.head] = self.positions
+        return self.refresh_flow_points()
+
+    def refresh_flow_points(self):
+        # Oldest to newest
+        order = (self.head + 1 + np.arange(self.tail_length)) % self.tail_length
+        coords = self.history[order].transpose(1, 0, 2)
+
+        # The axes map is affine, so three c2p calls give all of it
+        origin = self.axes.c2p(0, 0)
+        x_unit = self.axes.c2p(1, 0) - origin
+        y_unit = self.axes.c2p(0, 1) - origin
+
+        # Anchors on even indices with midpoint handles, and a handle on top
+        # of each tail's last anchor to end its subpath
+        points = self.anchor_buffer
+        anchors = points[:, 0::2]
+        anchors[:] = origin + coords[..., 0:1]*x_unit + coords[..., 1:2]*y_unit
+        points[:, 1:-1:2] = 0.5*(anchors[:, :-1] + anchors[:, 1:])
+        points[:, -1] = anchors[:, -1]
+
+        flat_points = points.reshape(-1, 3)[:-1]
+        if self.get_num_points() != len(flat_points):
+            self.set_points(flat_points)
+        else:
+            self.data["point"][:] = flat_points
+            self.note_changed_data()
+            self.refresh_bounding_box()
+        return self
+
+    def get_joint_angles(self, refresh=False):
+        # Tails are short straight segments drawn without joints, which
+        # spares a per-subpath pass over every particle each frame
+        return self.data["joint_angle"][:, 0]
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    from integrators import PendulumRHS
+
+    rhs = PendulumRHS(g=9.81, l=1.5)
+    axes = Axes(x_range=[-8, 8, 2], y_range=[-5, 5, 1]).scale(0.65)
+
+    for n_particles in [10000, 30000]:
+        flow = ParticleFlow(axes, rhs.field, n_particles=n_particles)
+        n_frames = 90
+        start = perf_counter()
+        for _ in range(n_frames):
+            flow.update(1/30)
+            # Everything the renderer asks of the mobject on the CPU side
+            flow.get_shader_data()
+        elapsed = perf_counter() - start
+        print(f"{n_particles:>6} particles: {elapsed/n_frames*1000:6.2f} ms/frame ({n_frames/elapsed:6.1f} fps)")
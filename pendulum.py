@@ -1,6 +1,13 @@
 import numpy as np
 from manimlib import *
 
+from integrators import PendulumRHS
+from mutable_geometry import MutableArc, MutableArrow
+from particle_flow import ParticleFlow
+from pendulum_motion import AngleLookupTable, SwingPendulum
+from phase_portrait import GrowTrajectories, TrajectoryBundle, get_seed_states
+from trajectory_cache import get_default_cache
+
 # class Text(Text):
 #     def __init__(
 #         self,
@@ -46,33 +53,26 @@ from manimlib import *
 
 
 class PendulumToPhasePlane(Scene):
-    def calculate_path(self, state_calc, init_state, time=5, dt=0.01):
-        multiplier = int(1/dt)
-        state_array = np.array([init_state])
-
-        old_state = np.array(init_state)
-        for _ in range(time*multiplier):
-            new_state = state_calc(old_state)
-            state_array = np.append(state_array, [new_state], axis=0)
-            old_state = new_state
-
-        state_array = state_array.T
-        return state_array
-
-    def calc_pendulum_state(self, prev_state, delta_t=0.01):
-        x1, x2 = prev_state
-        state_dt = np.array([x2, -(self.g/self.l)*np.sin(x1)])
-        new_state = prev_state + delta_t * state_dt
-        return new_state
+    def calculate_path(self, rhs, init_state, time=5, dt=0.01, method="rk4"):
+        # Repeat renders with unchanged dynamics load the path from disk
+        return get_default_cache().integrate(rhs, init_state, time=time, dt=dt, method=method)
 
     def construct(self):
         # First part: Pendulum animation
         r = 0.2
         g = 9.81
         l = 1.5
-        period = (g/l)**0.5
         theta = 45 * DEGREES  
 
+        # Swing angle integrated once, shared with every updater below
+        angle_table = AngleLookupTable(PendulumRHS(g=g, l=l), theta)
+        angle_tracker = ValueTracker(theta)
+        get_angle = angle_tracker.get_value
+
+        def get_bob_pos():
+            current_angle = get_angle()
+            return l*np.sin(current_angle)*RIGHT + l*np.cos(current_angle)*DOWN
+
         pendulum = VGroup(
             Line(start=[0,r], end=UP*l, color=WHITE),
             Circle(radius=r, color=RED_A, fill_color=RED, fill_opacity=1),
@@ -82,7 +82,7 @@ class PendulumToPhasePlane(Scene):
         bob_pos = l*np.sin(theta)*RIGHT + l*np.cos(theta)*DOWN
         initial_length = -1 * np.sin(theta)
         
-        perp_arrow = Arrow(
+        perp_arrow = MutableArrow(
             start=bob_pos,
             end=bob_pos + RIGHT * initial_length,
             buff=0,
@@ -93,25 +93,16 @@ class PendulumToPhasePlane(Scene):
         ).rotate(theta + PI/2, about_point=bob_pos).rotate(-PI/2, about_point=l*np.sin(theta)*RIGHT + l*np.cos(theta)*DOWN)
 
         def update_perp_arrow(group):
-            # Get current angle from pendulum's position
-            bob_pos = group[1].get_center()
-            current_angle = np.arctan2(bob_pos[0], -bob_pos[1])
+            current_angle = get_angle()
+            bob_pos = get_bob_pos()
             
             # Calculate new length based on sin(theta)
             new_length = -1 * np.sin(current_angle)  # Removed abs() to allow negative values
             
-            # Update perpendicular arrow
+            # Update perpendicular arrow in place, rotated to be perpendicular
             perp_arrow = group[2]
-            perp_arrow.become(Arrow(
-                start=bob_pos,
-                end=bob_pos + RIGHT * new_length,  # Length can be negative
-                buff=0,
-                thickness=3,
-                tip_width_ratio=3,
-                max_width_to_length_ratio=0.05,
-                color=WHITE
-            ))
-            perp_arrow.rotate(current_angle, about_point=bob_pos)  # Rotate to be perpendicular
+            direction = np.array([np.cos(current_angle), np.sin(current_angle), 0])
+            perp_arrow.put_start_and_end_on(bob_pos, bob_pos + new_length * direction)  # Length can be negative
         
         # Create downward arrow
         arrow_length = 0.7
@@ -145,13 +136,12 @@ class PendulumToPhasePlane(Scene):
         # Add a vertical line indicating theta
         theta_line = DashedLine(start=ORIGIN, end=DOWN*l, color=WHITE)
         
-        # Add angle arc
-        angle_arc = Arc(
+        # Add angle arc (styled as update_arc has always drawn it)
+        angle_arc = MutableArc(
             radius=0.5,
             angle=theta,
             start_angle=-PI/2,  # Start from vertical (pointing down)
-            color=WHITE,
-            stroke_width=2
+            color=YELLOW
         )
         
         # Add angle label
@@ -159,28 +149,17 @@ class PendulumToPhasePlane(Scene):
         angle_label.next_to(angle_arc, DOWN)  # Changed position to UP
         
         def update_arrow(arrow):
-            bob_center = bob.get_center()
+            bob_center = get_bob_pos()
             arrow.put_start_and_end_on(
                 bob_center,  # Start at bob's center
                 bob_center + DOWN * arrow_length  # End below bob
             )
             
         def update_arc(arc):
-            # Calculate current angle from pendulum's position
-            bob_pos = pendulum[1].get_center()
-            current_angle = np.arctan2(bob_pos[0], -bob_pos[1])  # Calculate angle from vertical
-            new_arc = Arc(
-                radius=0.5,
-                angle=current_angle,  # Use absolute value for correct arc
-                start_angle=-PI/2,
-                color=YELLOW
-            )
-            arc.become(new_arc)
+            arc.set_angle(get_angle())
             
         def update_label(label):
-            # Calculate current angle same way as arc
-            bob_pos = pendulum[1].get_center()
-            current_angle = np.arctan2(bob_pos[0], -bob_pos[1])
+            current_angle = get_angle()
             label_angle = current_angle/2  # Halfway between vertical and pendulum
             label_radius = 0.7
             new_pos = np.array([
@@ -224,18 +203,8 @@ class PendulumToPhasePlane(Scene):
         self.add(pivot)           # Add pivot last (top layer)
 
 
-        # Create the animation
-        self.play(
-            Rotate(pendulum, -2*theta, about_point=ORIGIN),
-            run_time=period/2,
-            rate_func=smooth
-        )
-        
-        self.play(
-            Rotate(pendulum, 2*theta, about_point=ORIGIN),
-            run_time=period/2,
-            rate_func=smooth
-        )
+        # Create the animation (one full period, out and back)
+        self.play(SwingPendulum(pendulum, angle_table, angle_tracker))
 
         # Show arrows and labels together
         self.play(
@@ -252,17 +221,7 @@ class PendulumToPhasePlane(Scene):
 
         # Continue animation
         for _ in range(1):
-            self.play(
-                Rotate(pendulum, -2*theta, about_point=ORIGIN),
-                run_time=period/2,
-                rate_func=smooth
-            )
-            
-            self.play(
-                Rotate(pendulum, 2*theta, about_point=ORIGIN),
-                run_time=period/2,
-                rate_func=smooth
-            )
+            self.play(SwingPendulum(pendulum, angle_table, angle_tracker))
 
         # Remove updaters before transformation
         ma_label.clear_updaters()
@@ -400,11 +359,8 @@ class PendulumToPhasePlane(Scene):
         axes_labels = VGroup(x_label, y_label)
 
         # Function for vector field
-        def calc_state_dt(coords_array):
-            result = np.zeros_like(coords_array)
-            result[:, 0] = coords_array[:, 1]
-            result[:, 1] = -(self.g/self.l)*np.sin(coords_array[:, 0])
-            return result
+        self.pendulum_rhs = PendulumRHS(g=self.g, l=self.l)
+        calc_state_dt = self.pendulum_rhs.field
         
 
         # Create vector field
@@ -418,7 +374,7 @@ class PendulumToPhasePlane(Scene):
 
         # Calculate trajectories
         trajectory1 = self.calculate_path(
-            self.calc_pendulum_state,
+            self.pendulum_rhs,
             [np.pi/4, 0],
             time=3,
             dt=0.01
@@ -427,9 +383,7 @@ class PendulumToPhasePlane(Scene):
 
         # Create path mobjects
         path1 = VMobject()
-        path1.set_points_smoothly([
-            axes.c2p(x, y) for x, y in zip(trajectory1[0], trajectory1[1])
-        ])
+        path1.set_points_smoothly(axes.c2p(*trajectory1))
         path1.set_color("#FFFFFF")
         path1.set_stroke(width=3)
 
@@ -455,3 +409,67 @@ class PendulumToPhasePlane(Scene):
         self.wait(2)
 
 
+class PendulumPhasePortrait(Scene):
+    def construct(self):
+        pendulum_rhs = PendulumRHS(g=9.81, l=1.5)
+
+        axes = Axes(
+            x_range=[-8, 8, 2],
+            y_range=[-5, 5, 1],
+            axis_config={"color": WHITE}
+        ).scale(0.65)
+
+        x_label = Tex(r"\theta").next_to(axes.x_axis.get_end(), RIGHT)
+        y_label = Tex(r"\dot{\theta}").next_to(axes.y_axis.get_end(), RIGHT)
+
+        vector_field = VectorField(
+            pendulum_rhs.field,
+            axes,
+            density=2.5,
+            stroke_width=1.5,
+            max_vect_len_to_step_size=0.5,
+        )
+
+        # Integrate a 50x40 grid of initial states together
+        trajectories = get_default_cache().integrate_ensemble(
+            pendulum_rhs,
+            get_seed_states(axes, n_x=50, n_y=40),
+            time=3,
+            dt=0.01
+        )
+        bundle = TrajectoryBundle(axes, trajectories, sample_stride=3, color=WHITE)
+
+        self.add(axes, x_label, y_label)
+        self.play(ShowCreation(vector_field))
+        self.play(GrowTrajectories(bundle), run_time=4, rate_func=linear)
+        self.wait(2)
+
+
+class PendulumPhaseFlow(Scene):
+    def construct(self):
+        pendulum_rhs = PendulumRHS(g=9.81, l=1.5)
+
+        axes = Axes(
+            x_range=[-8, 8, 2],
+            y_range=[-5, 5, 1],
+            axis_config={"color": WHITE}
+        ).scale(0.65)
+
+        x_label = Tex(r"\theta").next_to(axes.x_axis.get_end(), RIGHT)
+        y_label = Tex(r"\dot{\theta}").next_to(axes.y_axis.get_end(), RIGHT)
+
+        vector_field = VectorField(
+            pendulum_rhs.field,
+            axes,
+            density=2.5,
+            stroke_width=1.5,
+            stroke_opacity=0.4,
+            max_vect_len_to_step_size=0.5,
+        )
+
+        # Particles advected through the same field the arrows show
+        flow = ParticleFlow(axes, pendulum_rhs.field, n_particles=10000, color=BLUE_A)
+
+        self.add(axes, x_label, y_label, vector_field)
+        self.play(FadeIn(flow))
+        self.wait(10)
@@ -0,0 +1,75 @@
+from manimlib import *
+import numpy as np
+
+from trajectory_cache import get_default_cache
+
+
+class AngleLookupTable:
+    # theta(t) integrated once on a uniform grid, then read back by linear
+    # interpolation in O(1) per lookup
+    def __init__(self, rhs, init_angle, init_velocity=0, duration=10, dt=1/240, method="rk4"):
+        self.dt = dt
+        path = get_default_cache().integrate(
+            rhs, [init_angle, init_velocity], time=duration, dt=dt, method=method
+        )
+        self.angles = np.array(path[0])
+        self.velocities = np.array(path[1])
+        self.duration = (len(self.angles) - 1)*dt
+        self.period = self.find_period()
+
+    def find_period(self):
+        # Starting from rest, the velocity returns to zero moving the same way
+        # after one full period, i.e. at its second sign change
+        v = self.velocities
+        crossings = np.nonzero(np.sign(v[1:-1]) != np.sign(v[2:]))[0] + 1
+        if len(crossings) < 2:
+            return None
+        k = crossings[1]
+        # Interpolate the zero between samples k and k + 1
+        return (k + v[k]/(v[k] - v[k + 1]))*self.dt
+
+    def __call__(self, t):
+        k, frac = divmod(np.clip(t, 0, self.duration)/self.dt, 1)
+        k = int(k)
+        if k >= len(self.angles) - 1:
+            return self.angles[-1]
+        return self.angles[k] + frac*(self.angles[k + 1] - self.angles[k])
+
+
+class SwingPendulum(Animation):
+    # Rotates the pendulum about its pivot to the tabulated angle on each frame,
+    # and publishes that angle through angle_tracker for dependent updaters
+    def __init__(
+        self,
+        pendulum,
+        angle_table,
+        angle_tracker,
+        pivot=ORIGIN,
+        start_time=0,
+        run_time=None,
+        rate_func=linear,
+        suspend_mobject_updating=False,
+        **kwargs
+    ):
+        self.angle_table = angle_table
+        self.angle_tracker = angle_tracker
+        self.pivot = pivot
+        self.start_time = start_time
+        if run_time is None:
+            run_time = angle_table.period or angle_table.duration - start_time
+        super().__init__(
+            pendulum,
+            run_time=run_time,
+            rate_func=rate_func,
+            suspend_mobject_updating=suspend_mobject_updating,
+            **kwargs
+        )
+
+    def create_starting_mobject(self):
+        # Every frame is a rotation relative to the current angle, so no copy is needed
+        return self.mobject
+
+    def interpolate_mobject(self, alpha):
+        angle = self.angle_table(self.start_time + self.rate_func(alpha)*self.run_time)
+        self.mobject.rotate(angle - self.angle_tracker.get_value(), about_point=self.pivot)
+        self.angle_tracker.set_value(angle)
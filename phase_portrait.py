@@ -0,0 +1,102 @@
+from manimlib import *
+import numpy as np
+
+
+def get_seed_states(axes, n_x=50, n_y=40):
+    # Grid of initial states covering the visible range of the axes, as (N, 2)
+    x_min, x_max = axes.x_range[:2]
+    y_min, y_max = axes.y_range[:2]
+    xs, ys = np.meshgrid(np.linspace(x_min, x_max, n_x), np.linspace(y_min, y_max, n_y))
+    return np.column_stack([xs.ravel(), ys.ravel()])
+
+
+class TrajectoryBundle(VMobject):
+    # All trajectories of an (N, 2, T) ensemble drawn as subpaths of one VMobject
+    def __init__(
+        self,
+        axes,
+        trajectories,
+        stroke_width : float = 1,
+        stroke_opacity : float = 0.5,
+        sample_stride : int = 1,
+        **kwargs
+    ):
+        self.axes = axes
+        # Densely integrated trajectories rarely need every sample drawn
+        self.sample_stride = sample_stride
+        self.anchors = self.get_anchors_from_trajectories(trajectories)
+        super().__init__(stroke_width=stroke_width, stroke_opacity=stroke_opacity, **kwargs)
+        self.set_time_proportion(1)
+
+    def get_anchors_from_trajectories(self, trajectories):
+        trajectories = trajectories[:, :, ::self.sample_stride]
+        n_paths, _, n_samples = trajectories.shape
+        coords = trajectories.transpose(1, 0, 2).reshape(2, -1)
+        return self.axes.c2p(*coords).reshape(n_paths, n_samples, 3)
+
+    def set_trajectories(self, trajectories):
+        self.anchors = self.get_anchors_from_trajectories(trajectories)
+        return self.set_time_proportion(1)
+
+    def set_time_proportion(self, alpha):
+        # Shows every trajectory up to the same fraction of its duration
+        n_shown = max(2, int(round(alpha*self.anchors.shape[1])))
+        anchors = self.anchors[:, :n_shown]
+        n_paths = len(anchors)
+
+        # A path ends where a handle sits on top of its last anchor, so each
+        # trajectory contributes 2*n_shown points and the final one is dropped
+        points = np.empty((n_paths, 2*n_shown, 3))
+        points[:, 0::2] = anchors
+        points[:, 1:-1:2] = 0.5*(anchors[:, :-1] + anchors[:, 1:])
+        points[:, -1] = anchors[:, -1]
+        self.set_points(points.reshape(-1, 3)[:-1])
+        return self
+
+
+class GrowTrajectories(Animation):
+    def create_starting_mobject(self):
+        # The bundle regrows from its stored anchors, so skip copying it
+        return self.mobject
+
+    def interpolate_mobject(self, alpha):
+        self.mobject.set_time_proportion(self.rate_func(alpha))
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    from integrators import PendulumRHS, integrate, integrate_ensemble
+
+    rhs = PendulumRHS(g=9.81, l=1.5)
+    axes = Axes(x_range=[-8, 8, 2], y_range=[-5, 5, 1]).scale(0.65)
+
+    def legacy_build():
+        # What PendulumToPhasePlane originally did for its single trajectory
+        state_array = np.array([[np.pi/4, 0]])
+        old_state = state_array[0]
+        for _ in range(300):
+            new_state = old_state + 0.01*rhs(0, old_state)
+            state_array = np.append(state_array, [new_state], axis=0)
+            old_state = new_state
+        trajectory = state_array.T
+        path = VMobject()
+        path.set_points_smoothly([axes.c2p(x, y) for x, y in zip(trajectory[0], trajectory[1])])
+        return path
+
+    def single_build():
+        path = VMobject()
+        path.set_points_smoothly(axes.c2p(*integrate(rhs, [np.pi/4, 0], time=3, dt=0.01)))
+        return path
+
+    def ensemble_build():
+        trajectories = integrate_ensemble(rhs, get_seed_states(axes), time=3, dt=0.01)
+        return TrajectoryBundle(axes, trajectories, sample_stride=3)
+
+    timings = {}
+    for name, func in [("legacy single", legacy_build), ("single", single_build), ("ensemble of 2000", ensemble_build)]:
+        start = perf_counter()
+        func()
+        timings[name] = perf_counter() - start
+        print(f"{name:>18}: {timings[name]*1000:8.2f} ms")
+    print(f"2000 legacy builds would take about {timings['legacy single']*2000:.1f} s")
@@ -1,6 +1,9 @@
 from manimlib import *
 import numpy as np
 
+from colormaps import set_color_by_coordinate
+from grid_surface import GridSurface, TimeVaryingSurface
+
 def func():
     x = np.linspace(-3, 3, 60)
     y = np.linspace(-3, 3, 60)
@@ -23,48 +26,49 @@ class SurfacePlot3D(InteractiveScene):
         self.add(axes)
 
         x_mesh, y_mesh, z_mesh = func()
-        n_rows, n_cols = x_mesh.shape
 
         z_max = np.max(z_mesh)/2
         z_min = np.min(z_mesh)/2
 
-        def param_surface(u, v):
-            i = min(int(u * (n_rows - 1)), n_rows - 1)
-            j = min(int(v * (n_cols - 1)), n_cols - 1)
-
-            x = x_mesh[i, j]
-            y = y_mesh[i, j]
-            z = z_mesh[i, j]
-
-            return axes.c2p(x, y, z)  # lock to axes!
-
-        surface = ParametricSurface(
-            param_surface,
-            u_range=[0, 1],
-            v_range=[0, 1],
+        # The meshgrids go through the axes in one vectorized pass
+        surface = GridSurface(
+            x_mesh, y_mesh, z_mesh,
+            axes=axes,  # lock to axes!
             opacity=0.8,
-            resolution=(n_rows, n_cols),
             color=PURPLE
         )
 
-        def rgb_func(point):
-            # Extract the height (z-value)
-            x, y, z = point
-            
-            # Normalize z to [0, 1] where 0 is lowest and 1 is highest
-            normalized_z = np.clip((z - z_min) / (z_max - z_min), 0, 1)
-            
-            # Yellow RGB: (1, 1, 0)
-            # Dark Blue RGB: (0, 0, 0.5)
-            # Linear interpolation between the two colors
-            r = 1 - normalized_z  # From 1 (yellow) to 0 (dark blue)
-            g = 1 - normalized_z  # From 1 (yellow) to 0 (dark blue)
-            b = 0.5 * normalized_z  # From 0 (yellow) to 0.5 (dark blue)
-            
-            return np.array([r, g, b])
-        
-        # Apply the RGB function to the surface
-        surface.set_color_by_rgb_func(rgb_func)
+        # Yellow at the lowest point to dark blue at the highest, written
+        # into the color buffer in one pass
+        set_color_by_coordinate(surface, "yellow_to_dark_blue", axis=2, vmin=z_min, vmax=z_max)
 
         self.add(surface)
         self.wait(2)
+
+
+def ripple(x, y, t):
+    r = np.sqrt(x*x + y*y)
+    return np.sin(3*r - 2*t)/(1 + r)
+
+class RipplingSurface3D(InteractiveScene):
+    def construct(self):
+        self.frame.reorient(-14, 47, 0, (-0.32, -0.26, 1.13), 8.66)
+
+        axes = ThreeDAxes()
+        self.add(axes)
+
+        # func is evaluated over the whole grid once per frame, and the new
+        # heights and colors are written into the existing buffers
+        x = np.linspace(-3, 3, 200)
+        surface = TimeVaryingSurface(
+            ripple, x, x,
+            axes=axes,
+            colormap="yellow_to_dark_blue",
+            vmin=-1,
+            vmax=1,
+            opacity=0.8
+        )
+        surface.add_updater(lambda m, dt: m.advance(dt))
+
+        self.add(surface)
+        self.wait(8)
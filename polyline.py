@@ -0,0 +1,120 @@
+from manimlib import *
+import numpy as np
+
+
+# Densely sampled curves are mostly runs of collinear points. Douglas-Peucker
+# keeps only the samples needed for the polyline to stay within a tolerance of
+# the original, which by default is one pixel of the camera drawing it, so
+# building and drawing the curve scales with how much it bends rather than
+# with the sample count. Pass the scene's camera, so the tolerance follows its
+# resolution and zoom; without one, the default frame and resolution are assumed.
+
+
+def get_pixel_size(camera=None):
+    if camera is not None:
+        return camera.get_pixel_size()
+    return FRAME_WIDTH/DEFAULT_PIXEL_WIDTH
+
+
+def dot(a, b):
+    # Row-wise dot product of (3, N) arrays, quicker than (a*b).sum(0)
+    return a[0]*b[0] + a[1]*b[1] + a[2]*b[2]
+
+
+def get_simplified_indices(points, tolerance=None, camera=None):
+    # Douglas-Peucker on an (N, 3) array, returning the sorted indices kept.
+    # Each pass splits every open span at once, and spans already within
+    # tolerance drop out, so the loop runs once per level of refinement.
+    if tolerance is None:
+        tolerance = get_pixel_size(camera)
+    n_points = len(points)
+    if n_points <= 2:
+        return np.arange(n_points)
+    # One row per coordinate gathers much faster than rows of (x, y, z)
+    coords = np.array(points, dtype=float).T.copy()
+
+    keep = np.zeros(n_points, dtype=bool)
+    keep[[0, -1]] = True
+    # Samples whose span still needs checking
+    active = ~keep
+    while True:
+        indices = np.flatnonzero(active)
+        if len(indices) == 0:
+            break
+        kept_indices = np.flatnonzero(keep)
+        span = np.searchsorted(kept_indices, indices) - 1
+
+        # Squared distance of each sample from the chord of its span
+        start = coords.take(kept_indices[span], axis=1)
+        chord = coords.take(kept_indices[span + 1], axis=1) - start
+        offset = coords.take(indices, axis=1) - start
+        t = dot(offset, chord)/np.maximum(dot(chord, chord), 1e-30)
+        offset -= np.clip(t, 0, 1)*chord
+        dists = dot(offset, offset)
+
+        # Samples come sorted by span, so each span is a contiguous run
+        run_starts = np.flatnonzero(np.diff(span, prepend=-1))
+        run_lengths = np.diff(run_starts, append=len(indices))
+        run_max = np.maximum.reduceat(dists, run_starts)
+        split = run_max > tolerance**2
+
+        # First farthest sample of each run that needs splitting
+        candidates = np.flatnonzero(dists == np.repeat(run_max, run_lengths))
+        candidate_runs = np.searchsorted(run_starts, candidates, side="right") - 1
+        first = np.diff(candidate_runs, prepend=-1) > 0
+        candidates, candidate_runs = candidates[first], candidate_runs[first]
+        new_indices = indices[candidates[split[candidate_runs]]]
+
+        keep[new_indices] = True
+        active[:] = False
+        active[indices[np.repeat(split, run_lengths)]] = True
+        active[new_indices] = False
+    return np.flatnonzero(keep)
+
+
+def simplify_polyline(points, tolerance=None, camera=None):
+    points = np.asarray(points, dtype=float)
+    return points[get_simplified_indices(points, tolerance, camera)]
+
+
+def set_points_as_simplified_corners(vmobject, points, tolerance=None, camera=None):
+    return vmobject.set_points_as_corners(simplify_polyline(points, tolerance, camera))
+
+
+def set_points_simplified_smoothly(vmobject, points, tolerance=None, camera=None):
+    # Only suitable for curves without sharp corners: smoothing through sparse
+    # anchors overshoots at a step
+    return vmobject.set_points_smoothly(simplify_polyline(points, tolerance, camera))
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    from signals import gaussian, rect, tri
+
+    axes = Axes(x_range=(-3, 3, 1), y_range=(0, 1.5, 0.5))
+    curve = VMobject()
+    curve.set_fill(opacity=0.3)
+
+    def time_frames(build, n_frames=10):
+        # Building the curve, plus what the renderer asks of it on the CPU side
+        start = perf_counter()
+        for _ in range(n_frames):
+            build()
+            curve.get_shader_data()
+        return (perf_counter() - start)/n_frames
+
+    for name, signal in [("rect", rect()), ("tri*rect", tri()*rect(-0.2, 0.5)), ("gaussian", gaussian(sigma=0.4))]:
+        for n_samples in [3001, 100001]:
+            x = np.linspace(-3, 3, n_samples)
+            points = axes.c2p(x, signal(x))
+            times = [
+                time_frames(lambda: curve.set_points_smoothly(points)),
+                time_frames(lambda: curve.set_points_as_corners(points)),
+                time_frames(lambda: set_points_as_simplified_corners(curve, points)),
+            ]
+            n_kept = len(get_simplified_indices(points))
+            print(
+                f"{name:>9}, {n_samples:>6} samples -> {n_kept:>4} kept: smooth {times[0]*1e3:7.2f} ms, "
+                f"corners {times[1]*1e3:7.2f} ms, simplified corners {times[2]*1e3:6.2f} ms"
+            )
@@ -0,0 +1,157 @@
+from manimlib import *
+from manimlib.scene.scene import EndScene
+from pydub import AudioSegment
+import os
+import shutil
+import subprocess as sp
+
+
+# Scenes that end by repeating the same cycle of animations forever. Rather
+# than re-rendering identical frames, play_loop plays the cycle once to warm
+# up (the first play adds trackers to the scene, and updaters settle), then
+# renders it once more into its own file, checks that the scene came back to
+# where that cycle started, and has ffmpeg stream-copy the file as many times
+# as needed. Sound recorded over the cycle is repeated under each copy.
+#
+#     def construct(self):
+#         ...
+#         def cycle():
+#             self.play(tracker.animate.set_value(1))
+#             self.play(tracker.animate.set_value(0))
+#         play_loop(self, cycle, duration=600)
+
+
+def get_state_copies(scene):
+    return [(mob, mob.copy()) for mob in scene.mobjects]
+
+
+def state_matches(scene, state_copies):
+    return len(scene.mobjects) == len(state_copies) and all(
+        mob is scene_mob and mob_copy.looks_identical(mob)
+        for (mob, mob_copy), scene_mob in zip(state_copies, scene.mobjects)
+    )
+
+
+def concat_movies(ffmpeg_bin, paths, output_path):
+    list_path = os.path.splitext(output_path)[0] + "_segments.txt"
+    with open(list_path, "w") as file:
+        for path in paths:
+            file.write(f"file '{os.path.abspath(path)}'\n")
+    sp.run([
+        ffmpeg_bin, "-y",
+        "-f", "concat", "-safe", "0",
+        "-i", list_path,
+        "-c", "copy",
+        "-loglevel", "error",
+        output_path,
+    ], check=True)
+    os.remove(list_path)
+
+
+def get_n_repeats(cycle_time, n_repeats=None, duration=None):
+    if n_repeats is None:
+        n_repeats = max(int(np.ceil(duration/cycle_time)), 1) if duration else 1
+    return n_repeats
+
+
+def play_warm_up_cycle(scene, cycle, n_repeats=None, duration=None):
+    # Plays the first repetition, and returns how many there are in all
+    start_time = scene.time
+    cycle()
+    return get_n_repeats(scene.time - start_time, n_repeats, duration)
+
+
+def play_reusable_cycle(scene, cycle, n_remaining):
+    # Plays the cycle once, and returns how many copies of it stand for the
+    # n_remaining repetitions: all of them when the scene ends where it
+    # started, otherwise 1, having played the rest as well
+    start_state = get_state_copies(scene)
+    cycle()
+    if state_matches(scene, start_state):
+        return n_remaining
+    # Updaters or animations drift from cycle to cycle, so every
+    # repetition has to be rendered after all
+    log.warning("Scene state changed over one cycle, rendering every repetition")
+    for _ in range(n_remaining - 1):
+        cycle()
+    return 1
+
+
+def repeat_cycle_audio(writer, start_time, end_time, n_copies):
+    # The sound over [start_time, end_time], repeated under each copy of the
+    # cycle. The warm-up cycle rang into the recorded one just as each copy
+    # rings into the next, so only the last copy's overhang is added at the end.
+    writer.add_audio_segment(AudioSegment.silent(0), time=end_time)
+    segment = writer.audio_segment
+    start_ms, end_ms = int(1000*start_time), int(1000*end_time)
+    writer.audio_segment = segment[:end_ms] + segment[start_ms:end_ms]*(n_copies - 1) + segment[end_ms:]
+
+
+def play_loop(scene, cycle, n_repeats=None, duration=None):
+    # Runs cycle() n_repeats times, or enough times to fill duration seconds.
+    # This has to be the last thing the scene does when writing to a file,
+    # since it writes the finished movie and ends the scene. Without a target
+    # in a preview window, it loops until the window is closed, as a
+    # while True loop would.
+    writer = scene.file_writer
+    reuse_frames = writer.write_to_movie and not writer.subdivide_output and not scene.skip_animations
+
+    if not reuse_frames:
+        if n_repeats is None and duration is None and scene.window is None:
+            n_repeats = 1
+        count = 0
+        start_time = scene.time
+        while n_repeats is None or count < n_repeats:
+            cycle()
+            count += 1
+            if duration is not None and scene.time - start_time >= duration:
+                break
+            if scene.is_window_closing():
+                break
+        return
+
+    n_repeats = play_warm_up_cycle(scene, cycle, n_repeats, duration)
+    if n_repeats == 1:
+        return
+
+    # Close off everything rendered so far, then record the cycle on its own
+    movie_path = writer.get_movie_file_path()
+    stem, ext = os.path.splitext(movie_path)
+    writer.close_movie_pipe()
+    shutil.move(movie_path, stem + "_head" + ext)
+    segments = [stem + "_head" + ext]
+    cycle_path = stem + "_cycle" + ext
+    writer.open_movie_pipe(cycle_path)
+
+    start_time = scene.time
+    n_copies = play_reusable_cycle(scene, cycle, n_repeats - 1)
+    writer.close_movie_pipe()
+
+    segments += n_copies*[cycle_path]
+    concat_movies(writer.ffmpeg_bin, segments, movie_path)
+    for path in set(segments):
+        os.remove(path)
+    if writer.includes_sound:
+        repeat_cycle_audio(writer, start_time, scene.time, n_copies)
+        writer.add_sound_to_video()
+
+    # The movie is complete, so the writer has nothing left to close
+    writer.write_to_movie = False
+    writer.print_file_ready_message(movie_path)
+    raise EndScene()
+
+
+if __name__ == "__main__":
+    # Checks that the convolution sweep comes back to where it started, so
+    # that every repetition after the warm-up is a copy
+    import convolution
+
+    def check_loop(scene, cycle, n_repeats=None, duration=None):
+        n_repeats = play_warm_up_cycle(scene, cycle, n_repeats, duration)
+        n_copies = play_reusable_cycle(scene, cycle, n_repeats - 1)
+        assert n_copies == n_repeats - 1, (n_copies, n_repeats)
+        print(f"{type(scene).__name__}: {n_repeats} repetitions, the last {n_copies} copied")
+        raise EndScene()
+
+    convolution.play_loop = check_loop
+    convolution.VisualiseConvolution(file_writer_config=dict(write_to_movie=False)).run()
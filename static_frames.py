@@ -0,0 +1,70 @@
+from manimlib import *
+import numpy as np
+
+
+def copy_uniforms(mobject):
+    return {key: np.array(value) for key, value in mobject.uniforms.items()}
+
+
+def uniforms_match(uniforms1, uniforms2):
+    return uniforms1.keys() == uniforms2.keys() and all(
+        np.array_equal(uniforms1[key], uniforms2[key]) for key in uniforms1
+    )
+
+
+class StaticFrameReuse:
+    # Scene mixin for rendering to a file. When nothing drawn has changed since
+    # the last frame (no mobject has noted changed data or changed a uniform,
+    # such as its gloss or being fixed in frame, and the camera has not moved)
+    # the frame is not redrawn, and the previous image still in the
+    # framebuffer is written again. Together with updaters that skip when
+    # their trackers are constant (see derived.py), a wait costs close to
+    # nothing. A preview window always redraws.
+    #
+    #     class MyScene(StaticFrameReuse, InteractiveScene):
+    #         ...
+    last_frame_state = None
+
+    def get_frame_state(self):
+        frame = self.camera.frame
+        light = self.camera.light_source
+        family = [mob for group in self.render_groups for mob in group.get_family()]
+        return (
+            list(self.render_groups),
+            frame.data.copy(),
+            copy_uniforms(frame),
+            light.get_points().copy(),
+            family,
+            [copy_uniforms(mob) for mob in family],
+        )
+
+    def frame_states_match(self, state1, state2):
+        groups1, data1, uniforms1, light1, family1, family_uniforms1 = state1
+        groups2, data2, uniforms2, light2, family2, family_uniforms2 = state2
+        return all((
+            len(groups1) == len(groups2),
+            all(g1 is g2 for g1, g2 in zip(groups1, groups2)),
+            np.array_equal(data1, data2),
+            uniforms_match(uniforms1, uniforms2),
+            np.array_equal(light1, light2),
+            len(family1) == len(family2),
+            all(m1 is m2 for m1, m2 in zip(family1, family2)),
+            all(map(uniforms_match, family_uniforms1, family_uniforms2)),
+        ))
+
+    def update_frame(self, dt=0, force_draw=False):
+        if self.window is not None or self.skip_animations or force_draw:
+            self.last_frame_state = None
+            return super().update_frame(dt, force_draw)
+
+        self.increment_time(dt)
+        self.update_mobjects(dt)
+        state = self.get_frame_state()
+        is_static = (
+            self.last_frame_state is not None
+            and not any(group._data_has_changed for group in self.render_groups)
+            and self.frame_states_match(state, self.last_frame_state)
+        )
+        if not is_static:
+            self.camera.capture(*self.render_groups)
+        self.last_frame_state = state
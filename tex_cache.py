@@ -0,0 +1,162 @@
+import ast
+import hashlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+
+# manimlib keeps compiled LaTeX in its on-disk cache, shared by every scene.
+# This module fills that cache ahead of time: it finds the Tex and TexText
+# calls in scene files whose arguments can be worked out statically, and
+# builds the ones not seen before in a process pool, so a cold render only
+# pays for SVG parsing.
+#
+#     python tex_cache.py pendulum.py circ_area_derivation.py -j 8
+#
+# manimlib reads sys.argv when first imported, so it is imported lazily here.
+
+TEX_CLASSES = ("Tex", "TexText")
+SAFE_NODES = (
+    ast.Expression, ast.Constant, ast.Name, ast.Load, ast.Dict, ast.List, ast.Tuple,
+    ast.Set, ast.BinOp, ast.UnaryOp, ast.operator, ast.unaryop, ast.Subscript,
+    ast.Slice, ast.keyword, ast.Call,
+)
+
+
+def get_marker_dir():
+    from manimlib.utils.directories import get_cache_dir
+    return os.path.join(get_cache_dir(), "tex_prewarm")
+
+
+def get_tex_key(class_name, args, kwargs):
+    # Everything that changes the compiled SVG: the strings, the template and
+    # preamble, and the color map, which decides how substrings are labelled.
+    # Font size only scales the result, so it is left out.
+    color_map = {**kwargs.get("t2c", {}), **kwargs.get("tex_to_color_map", {})}
+    key_items = (
+        class_name,
+        tuple(args),
+        kwargs.get("template", ""),
+        kwargs.get("additional_preamble", ""),
+        kwargs.get("alignment", ""),
+        sorted(color_map.items()),
+        repr(kwargs.get("isolate", [])),
+    )
+    return hashlib.sha256(repr(key_items).encode()).hexdigest()
+
+
+def is_safe(node):
+    for sub_node in ast.walk(node):
+        if not isinstance(sub_node, SAFE_NODES):
+            return False
+        # The only call allowed is dict(...)
+        if isinstance(sub_node, ast.Call):
+            if not (isinstance(sub_node.func, ast.Name) and sub_node.func.id == "dict"):
+                return False
+    return True
+
+
+def safe_eval(node, namespace):
+    if not is_safe(node):
+        raise ValueError("Not a static expression")
+    return eval(compile(ast.Expression(node), "<tex_cache>", "eval"), namespace)
+
+
+class TexCallFinder(ast.NodeVisitor):
+    # Walks a scene file in source order, tracking simple assignments such as
+    # t2c = {...} or kw = dict(...) so that Tex(..., **kw) can be resolved
+    def __init__(self):
+        import manimlib
+        self.namespace = {"dict": dict, **vars(manimlib)}
+        self.calls = []
+
+    def visit_Assign(self, node):
+        self.generic_visit(node)
+        if len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            try:
+                self.namespace[node.targets[0].id] = safe_eval(node.value, self.namespace)
+            except Exception:
+                self.namespace.pop(node.targets[0].id, None)
+
+    def visit_Call(self, node):
+        self.generic_visit(node)
+        if not (isinstance(node.func, ast.Name) and node.func.id in TEX_CLASSES):
+            return
+        try:
+            args = [safe_eval(arg, self.namespace) for arg in node.args]
+            kwargs = {}
+            for keyword in node.keywords:
+                value = safe_eval(keyword.value, self.namespace)
+                if keyword.arg is None:
+                    kwargs.update(value)
+                else:
+                    kwargs[keyword.arg] = value
+        except Exception:
+            return
+        if all(isinstance(arg, str) for arg in args):
+            self.calls.append((node.func.id, tuple(args), kwargs))
+
+
+def find_tex_calls(path):
+    with open(path, encoding="utf-8") as file:
+        tree = ast.parse(file.read(), filename=path)
+    finder = TexCallFinder()
+    finder.visit(tree)
+    return finder.calls
+
+
+def build_tex(class_name, args, kwargs, key):
+    # Runs in a worker process, where building the mobject compiles the LaTeX
+    # into manimlib's disk cache
+    import manimlib
+    getattr(manimlib, class_name)(*args, **kwargs)
+    open(os.path.join(get_marker_dir(), key), "w").close()
+    return key
+
+
+def prewarm(paths, max_workers=None):
+    os.makedirs(get_marker_dir(), exist_ok=True)
+    warm_keys = set(os.listdir(get_marker_dir()))
+
+    misses = {}
+    n_calls = 0
+    for path in paths:
+        for class_name, args, kwargs in find_tex_calls(path):
+            n_calls += 1
+            key = get_tex_key(class_name, args, kwargs)
+            if key not in warm_keys:
+                misses[key] = (class_name, args, kwargs)
+
+    print(f"{n_calls} static Tex calls, {len(misses)} to compile")
+    failures = 0
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(build_tex, class_name, args, kwargs, key): args
+            for key, (class_name, args, kwargs) in misses.items()
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as error:
+                failures += 1
+                print(f"Failed on {futures[future]}: {error}")
+    return len(misses) - failures
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile the LaTeX used by scene files ahead of rendering")
+    parser.add_argument("paths", nargs="*", help="Scene files to scan (defaults to every .py file here)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Number of worker processes")
+    args = parser.parse_args()
+    # Keep manimlib's own argument parsing from seeing ours
+    sys.argv = sys.argv[:1]
+
+    paths = args.paths or sorted(
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+        for name in os.listdir(os.path.dirname(os.path.abspath(__file__)))
+        if name.endswith(".py") and name != os.path.basename(__file__)
+    )
+    n_compiled = prewarm(paths, max_workers=args.jobs)
+    print(f"Compiled {n_compiled} new Tex objects")
@@ -0,0 +1,119 @@
+import hashlib
+import os
+
+import numpy as np
+from manimlib.utils.directories import get_cache_dir
+
+from integrators import integrate, integrate_ensemble
+
+
+# Bump when integrator output changes, so stale trajectories are not reused
+CACHE_VERSION = 1
+
+
+class TrajectoryCache:
+    # Integrated trajectories stored as .npy files and loaded back memory-mapped.
+    # The least recently used files are evicted once the directory grows past
+    # max_bytes.
+    def __init__(self, directory=None, max_bytes=256 * 2**20):
+        self.directory = directory or os.path.join(get_cache_dir(), "trajectories")
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get_key(self, kind, rhs, init_state, **params):
+        init_state = np.ascontiguousarray(init_state, dtype=float)
+        hasher = hashlib.sha256()
+        hasher.update(repr((
+            CACHE_VERSION,
+            kind,
+            f"{type(rhs).__module__}.{type(rhs).__qualname__}",
+            rhs.get_key(),
+            sorted(params.items()),
+            init_state.shape,
+        )).encode())
+        hasher.update(init_state.tobytes())
+        return hasher.hexdigest()
+
+    def get_path(self, key):
+        return os.path.join(self.directory, key + ".npy")
+
+    def get(self, key):
+        path = self.get_path(key)
+        try:
+            result = np.load(path, mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+        # Touch the file so eviction sees it as recently used
+        os.utime(path)
+        return result
+
+    def put(self, key, array):
+        path = self.get_path(key)
+        # Write under a temporary name first so readers never see a partial file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as file:
+            np.save(file, array)
+        os.replace(temp_path, path)
+        self.evict(keep=path)
+        return np.load(path, mmap_mode="r")
+
+    def get_entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".npy"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def get_total_bytes(self):
+        return sum(size for _, size, _ in self.get_entries())
+
+    def evict(self, keep=None):
+        entries = self.get_entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.get_entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def integrate(self, rhs, init_state, time=5, dt=0.01, method="rk4", **kwargs):
+        key = self.get_key("single", rhs, init_state, time=time, dt=dt, method=method, **kwargs)
+        result = self.get(key)
+        if result is None:
+            result = self.put(key, integrate(rhs, init_state, time=time, dt=dt, method=method, **kwargs))
+        return result
+
+    def integrate_ensemble(self, rhs, init_states, time=5, dt=0.01, method="rk4", **kwargs):
+        key = self.get_key("ensemble", rhs, init_states, time=time, dt=dt, method=method, **kwargs)
+        result = self.get(key)
+        if result is None:
+            result = self.put(key, integrate_ensemble(rhs, init_states, time=time, dt=dt, method=method, **kwargs))
+        return result
+
+
+_default_cache = None
+
+
+def get_default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = TrajectoryCache()
+    return _default_cache
@@ -1,59 +1,17 @@
 from manimlib import *
-
-
-class Arrow3D(Group):
-    def __init__(
-        self,
-        direction,
-        start = ORIGIN,
-        color = WHITE,
-        shaft_radius : float = 0.03,
-        tip_length : float = 0.3,
-        tip_radius : float = 0.1,
-        buff : float = 0,
-        **kwargs
-    ):
-        super().__init__(**kwargs)
-        self.direction = np.array(direction)
-        self.length = np.linalg.norm(direction)
-        self.start = start
-        self.tip = direction + self.start
-
-        # Normalize direction
-        norm_dir = direction / np.linalg.norm(direction)
-        arrow_start = start + buff * norm_dir
-        shaft_length = self.length - tip_length
-
-        # Create the shaft: along Z-axis
-        shaft = Cylinder(radius=shaft_radius, height=shaft_length, resolution=(24, 16))
-        shaft.set_color(color=color)
-        shaft.shift(OUT * (shaft_length / 2))  # Position at the center of the shaft
-
-        # Create the tip: aligned on top of the shaft (keeping original positioning)
-        tip = Cone(radius=tip_radius, height=tip_length, resolution=(24, 16))
-        tip.set_color(color=color)
-        tip.shift(OUT * (shaft_length - 1.2*tip_length))  # Original positioning
-
-        # Combine the shaft and tip into a single group
-        full_arrow = Group(shaft, tip)
-
-        # Rotate the entire arrow to align with the given direction
-        rot_axis = np.cross(OUT, norm_dir)
-        angle = angle_between_vectors(OUT, norm_dir)
-        if np.linalg.norm(rot_axis) > 1e-6:
-            full_arrow.rotate(angle, axis=rot_axis, about_point=arrow_start)
-
-        # We need to shift it to make sure it starts at the origin and points toward the direction
-        full_arrow.shift(arrow_start)  # First shift to the starting point
-        
-        self.add(full_arrow)
-
+from arrow_field import Arrow3D, Arrow3DField
+from billboard import BillboardLabel, BillboardLabels, add_billboard_updater
+from classification import NearestClassCloud, classify
+from derived import DerivedValue, add_derived_updater
+from level_of_detail import add_level_of_detail_updater
+from voronoi_regions import VoronoiRegions
 
 
 class NearestVectorClassification3D(InteractiveScene):
+    show_regions = False
+
     def construct(self):
         self.frame.reorient(-130, 67, 0, (-0.24, -0.31, 0.97), 5.89)
-        theta, phi = self.frame.get_euler_angles()[:2]
         # self.add(Text(str(l[0:2]*D)))
         # Axes
         axes = ThreeDAxes(x_range=[-4, 4], y_range=[-4, 4], z_range=[-4, 4])
@@ -67,65 +25,53 @@ class NearestVectorClassification3D(InteractiveScene):
         }
 
         arrows = Group()
-        labels = VGroup()
+        labels = BillboardLabels()
 
         for name, data in class_vectors.items():
             vec = data["vec"]
             color = data["color"]
             arrow = Arrow3D(direction=vec, color=color, start=ORIGIN)
             
-            # Create label as a TextMobject with billboarding effect
-            label = Text(name, font_size=24)
-            label.move_to(1.1*vec)
-            
-            # Setup updating function to make label face camera
-            label.rotate(phi, axis=RIGHT)
-            label.rotate(theta, axis=OUT) 
-            
-            # def update_label(m: Mobject):
-            #     m.become( Text(name, font_size=24, fill_color=GREY).move_to(1.1*vec).rotate(phi, axis=RIGHT).rotate(theta, axis=OUT) )
+            # Label built once, then turned to face the camera
+            label = BillboardLabel(name, 1.1*vec, font_size=24)
 
-            # label.add_updater(update_label)
-            
             arrows.add(arrow)
             labels.add(label)
 
+        # One updater turns every label when the camera moves
+        labels.refresh_billboard_layout()
+        labels.face_camera(self.frame)
+        add_billboard_updater(labels, self.frame)
+
+        add_level_of_detail_updater(arrows, self.frame)
         self.play(*[FadeIn(arrow) for arrow in arrows])
-        self.play(*[FadeIn(label) for label in labels])
+        self.play(FadeIn(labels))
         self.wait()
 
         # Test vector
         test_vec = np.array([0.25, -1, 1.8])
         test_arrow = Arrow3D(test_vec, color=RED)
-        test_label = Text("Test", font_size=24)
-        test_label.move_to(1.1*test_vec)
-        test_label.rotate(phi, axis=RIGHT)
-        test_label.rotate(theta, axis=OUT) 
-        
-        def label_updater(m : Mobject):
-            theta, phi = self.frame.get_euler_angles()[:2]
-            m.become(Text("Test", font_size=24)).rotate(phi, axis=RIGHT).rotate(theta, axis=OUT).move_to(1.1*test_vec)
+        test_label = BillboardLabel("Test", 1.1*test_vec, font_size=24)
+        test_label.face_camera(self.frame)
 
         # Add updater to test label
-        test_label.add_updater(label_updater)
-        
+        add_billboard_updater(test_label, self.frame)
+
+        add_level_of_detail_updater(test_arrow, self.frame)
         self.play(FadeIn(test_arrow), FadeIn(test_label))
         self.wait()
 
-        # Draw dashed lines to each class vector and calculate distances
-        lines = []
-        distances = []
-        for name, data in class_vectors.items():
-            end = data["vec"]
-            line = DashedLine(test_vec, end, color=GREY_A)
-            lines.append(line)
-            distances.append(np.linalg.norm(test_vec - end))
+        # Draw dashed lines to each class vector
+        lines = [
+            DashedLine(test_vec, data["vec"], color=GREY_A)
+            for data in class_vectors.values()
+        ]
 
         self.play(*[ShowCreation(line) for line in lines])
         self.wait()
 
         # Highlight nearest class
-        nearest_idx = np.argmin(distances)
+        nearest_idx = classify(test_vec, [data["vec"] for data in class_vectors.values()])[0][0]
         nearest_color = list(class_vectors.values())[nearest_idx]["color"]
         nearest_name = list(class_vectors.keys())[nearest_idx]
         self.play(self.frame.animate.reorient(-75, 74, 0, (-0.05, -0.82, 1.02), 3.88), run_time=2)
@@ -140,3 +86,66 @@ class NearestVectorClassification3D(InteractiveScene):
         self.play(FadeIn(result))
         self.wait(3)
 
+        if self.show_regions:
+            self.show_decision_regions(class_vectors, arrows, labels)
+
+    def show_decision_regions(self, class_vectors, arrows, labels):
+        vectors = np.array([data["vec"] for data in class_vectors.values()])
+        colors = [data["color"] for data in class_vectors.values()]
+        regions = VoronoiRegions(vectors, colors)
+        self.play(FadeIn(regions))
+
+        # Orbiting only moves the camera; the boundaries stay as built
+        self.play(self.frame.animate.increment_theta(90*DEG), run_time=4)
+
+        # Swinging class A about OUT rebuilds only the boundaries around it,
+        # and swinging it back finds the first layout in the cache
+        angle_tracker = ValueTracker(0)
+        moved = DerivedValue(
+            lambda angle: np.vstack([rotation_matrix(angle, OUT) @ vectors[0], vectors[1:]]),
+            angle_tracker,
+        )
+        add_derived_updater(regions, lambda m, v: m.set_class_vectors(v), moved)
+        add_derived_updater(arrows[0], lambda m, v: m.put_start_and_end_on(ORIGIN, v[0]), moved)
+        add_derived_updater(labels[0], lambda m, v: m.set_anchor(1.1*v[0]), moved)
+        self.play(angle_tracker.animate.set_value(PI/2), run_time=4)
+        self.play(angle_tracker.animate.set_value(0), run_time=4)
+        self.wait()
+
+
+class NearestVectorRegions3D(NearestVectorClassification3D):
+    show_regions = True
+
+
+
+class NearestClassCloud3D(InteractiveScene):
+    n_samples = 20000
+    n_classes = 24
+
+    def construct(self):
+        self.frame.reorient(-130, 67, 0, ORIGIN, 9)
+        axes = ThreeDAxes(x_range=[-4, 4], y_range=[-4, 4], z_range=[-4, 4])
+        self.add(axes)
+
+        # Class vectors spread over a sphere, turning about a tilted axis
+        rng = np.random.default_rng(0)
+        base_vectors = rng.normal(size=(self.n_classes, 3))
+        base_vectors *= 2.5/np.linalg.norm(base_vectors, axis=1)[:, np.newaxis]
+        colors = color_gradient([BLUE, TEAL, GREEN, YELLOW, ORANGE, RED, PINK, PURPLE], self.n_classes)
+        t_tracker = ValueTracker(0)
+        axis = normalize(np.array([1, 1, 2]))
+        vectors = DerivedValue(lambda t: base_vectors @ rotation_matrix(t, axis).T, t_tracker)
+
+        arrows = Arrow3DField(ORIGIN, base_vectors, colors=colors)
+        add_level_of_detail_updater(arrows, self.frame)
+        add_derived_updater(arrows, lambda m, v: m.set_vectors(v), vectors)
+
+        # Every sample colored by its nearest class vector
+        samples = 1.5*rng.normal(size=(self.n_samples, 3))
+        cloud = NearestClassCloud(samples, base_vectors, colors, opacity=0.6)
+        add_derived_updater(cloud, lambda m, v: m.set_class_vectors(v), vectors)
+
+        self.play(FadeIn(arrows))
+        self.play(FadeIn(cloud))
+        self.play(t_tracker.animate.set_value(TAU), run_time=12, rate_func=linear)
+        self.wait()
@@ -0,0 +1,224 @@
+from manimlib import *
+from collections import OrderedDict
+import numpy as np
+
+from classification import classify
+
+
+# Decision regions of nearest-class classification in 3D. The volume is
+# sampled on a voxel grid and every voxel labelled in one pass. Wherever
+# neighbouring voxels disagree, classes a and b share a boundary, which lies
+# on the plane bisecting their class vectors. Each boundary is drawn as that
+# plane, cut to the voxel faces between a and b: the faces across the axis
+# closest to the plane's normal are projected along that axis onto the plane,
+# which gives one continuous patch per pair of classes.
+#
+# Patches are cached per pair and only rebuilt when one of the pair's
+# vectors or its set of faces changes, and whole layouts are cached by the
+# class vectors, so orbiting the camera redraws a fixed mesh and moving one
+# class vector only rebuilds the boundaries around it.
+
+
+class VoronoiRegions(Surface):
+    def __init__(
+        self,
+        class_vectors,
+        class_colors,
+        x_range=(-4, 4),
+        y_range=(-4, 4),
+        z_range=(-4, 4),
+        resolution : int = 40,
+        opacity : float = 0.3,
+        max_cached_layouts : int = 8,
+        **kwargs
+    ):
+        self.class_vectors = np.array(class_vectors, dtype=float).reshape(-1, 3)
+        self.class_rgbas = np.array([color_to_rgba(color, opacity) for color in class_colors])
+        self.max_cached_layouts = max_cached_layouts
+        self.layout_cache = OrderedDict()
+        self.pair_meshes = {}
+
+        # Voxel centres, indexed [x, y, z] and flattened in that order
+        ranges = (x_range, y_range, z_range)
+        self.grid_shape = (resolution,)*3
+        self.voxel_size = np.array([(high - low)/resolution for low, high in ranges])
+        axes = [
+            low + (np.arange(resolution) + 0.5)*size
+            for (low, high), size in zip(ranges, self.voxel_size)
+        ]
+        self.grid_centers = np.stack(np.meshgrid(*axes, indexing="ij"), -1).reshape(-1, 3)
+        self.labels, self.distances = classify(self.grid_centers, self.class_vectors)
+
+        super().__init__(**kwargs)
+
+    def init_points(self):
+        self.refresh_region_mesh()
+
+    def init_colors(self):
+        # Each boundary's color is written along with its points
+        pass
+
+    def compute_triangle_indices(self):
+        return self.triangle_indices
+
+    def set_class_vectors(self, class_vectors):
+        class_vectors = np.array(class_vectors, dtype=float).reshape(-1, 3)
+        moved = np.flatnonzero(np.any(class_vectors != self.class_vectors, axis=1))
+        if len(moved) == 0:
+            return self
+        self.class_vectors = class_vectors
+        if self.class_vectors.tobytes() not in self.layout_cache:
+            self.relabel_voxels(moved)
+        return self.refresh_region_mesh()
+
+    def relabel_voxels(self, moved):
+        # Only voxels in a moved class's region, or now nearer to a moved
+        # vector than to their own class, can change label
+        candidates = np.isin(self.labels, moved)
+        for index in moved:
+            offsets = self.grid_centers - self.class_vectors[index]
+            candidates |= np.einsum("ij,ij->i", offsets, offsets) < self.distances**2
+        candidates = np.flatnonzero(candidates)
+        self.labels[candidates], self.distances[candidates] = classify(
+            self.grid_centers[candidates], self.class_vectors
+        )
+
+    def get_boundary_faces(self, axis):
+        # Voxels on the low side of each face across the given axis where the
+        # labels differ, and the (low class, high class) pair of each
+        labels = self.labels.reshape(self.grid_shape)
+        n = self.grid_shape[axis]
+        low = labels.take(range(n - 1), axis=axis)
+        high = labels.take(range(1, n), axis=axis)
+        positions = np.nonzero(low != high)
+        low_voxels = np.ravel_multi_index(positions, self.grid_shape)
+        pairs = np.sort(np.array([low[positions], high[positions]]).T, axis=1)
+        return low_voxels, pairs
+
+    def get_pair_faces(self):
+        # For each pair of classes sharing a boundary, the low voxels of its
+        # faces across the axis nearest the bisecting plane's normal
+        faces_by_axis = [self.get_boundary_faces(axis) for axis in range(3)]
+        n_classes = len(self.class_vectors)
+        all_pairs = np.unique(np.vstack([pairs for voxels, pairs in faces_by_axis]), axis=0)
+
+        pair_faces = {}
+        codes_by_axis = [pairs[:, 0]*n_classes + pairs[:, 1] for voxels, pairs in faces_by_axis]
+        for a, b in all_pairs.tolist():
+            axis = np.argmax(np.abs(self.class_vectors[b] - self.class_vectors[a]))
+            voxels = faces_by_axis[axis][0][codes_by_axis[axis] == a*n_classes + b]
+            if len(voxels) > 0:
+                pair_faces[(a, b)] = (axis, voxels)
+        return pair_faces
+
+    def get_pair_mesh(self, a, b, axis, voxels):
+        # Quads on the plane bisecting class vectors a and b, over the given
+        # faces: point, du_point and dv_point with 4 vertices per face
+        va, vb = self.class_vectors[a], self.class_vectors[b]
+        normal = vb - va
+        offset = 0.5*(vb @ vb - va @ va)
+        other_axes = [i for i in range(3) if i != axis]
+
+        face_centers = self.grid_centers[voxels].copy()
+        face_centers[:, axis] += 0.5*self.voxel_size[axis]
+        corners = np.repeat(face_centers[:, np.newaxis], 4, axis=1)
+        signs = np.array([[-1, -1], [1, -1], [-1, 1], [1, 1]])
+        corners[:, :, other_axes] += 0.5*signs*self.voxel_size[other_axes]
+        corners = corners.reshape(-1, 3)
+        # Slide each corner along the axis onto the plane
+        corners[:, axis] += (offset - corners @ normal)/normal[axis]
+
+        # Two directions within the plane, for the shader's normals
+        du = np.cross(normal, np.eye(3)[other_axes[0]])
+        du = 1e-3*du/get_norm(du)
+        dv = 1e-3*normalize(np.cross(normal, du))
+        return corners, corners + du, corners + dv
+
+    def refresh_region_mesh(self):
+        key = self.class_vectors.tobytes()
+        if key in self.layout_cache:
+            self.layout_cache.move_to_end(key)
+            layout = self.layout_cache[key]
+            self.n_rebuilt_pairs = 0
+        else:
+            layout = self.build_layout()
+            self.layout_cache[key] = layout
+            if len(self.layout_cache) > self.max_cached_layouts:
+                self.layout_cache.popitem(last=False)
+
+        self.labels, self.distances, points, du_points, dv_points, rgbas, self.triangle_indices = (
+            array.copy() for array in layout
+        )
+        self.set_points(points)
+        self.data["du_point"][:] = du_points
+        self.data["dv_point"][:] = dv_points
+        self.data["rgba"][:] = rgbas
+        self.note_changed_data()
+        return self
+
+    def build_layout(self):
+        pair_faces = self.get_pair_faces()
+        self.n_rebuilt_pairs = 0
+        meshes = []
+        for (a, b), (axis, voxels) in pair_faces.items():
+            cached = self.pair_meshes.get((a, b))
+            if cached is None or not all((
+                np.array_equal(cached[0], self.class_vectors[[a, b]]),
+                cached[1] == axis,
+                np.array_equal(cached[2], voxels),
+            )):
+                mesh = self.get_pair_mesh(a, b, axis, voxels)
+                cached = (self.class_vectors[[a, b]], axis, voxels, mesh)
+                self.pair_meshes[(a, b)] = cached
+                self.n_rebuilt_pairs += 1
+            meshes.append(((a, b), cached[3]))
+        # Pairs that no longer share a boundary
+        for pair in set(self.pair_meshes) - set(pair_faces):
+            del self.pair_meshes[pair]
+
+        if not meshes:
+            empty = np.zeros((0, 3))
+            return (self.labels, self.distances, empty, empty, empty, np.zeros((0, 4)), np.zeros(0, dtype=int))
+
+        points, du_points, dv_points = (np.vstack([mesh[i] for pair, mesh in meshes]) for i in range(3))
+        # Each boundary takes the average of its two classes' colors
+        rgbas = np.repeat([
+            0.5*(self.class_rgbas[a] + self.class_rgbas[b])
+            for (a, b), mesh in meshes
+        ], [len(mesh[0]) for pair, mesh in meshes], axis=0)
+        quad = np.array([0, 1, 2, 2, 1, 3])
+        triangle_indices = (4*np.arange(len(points)//4)[:, np.newaxis] + quad).ravel()
+        return (self.labels, self.distances, points, du_points, dv_points, rgbas, triangle_indices)
+
+    def get_class_regions(self):
+        # Voxel labels on the grid, indexed [x, y, z]
+        return self.labels.reshape(self.grid_shape)
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    rng = np.random.default_rng(0)
+    class_vectors = rng.uniform(-3, 3, (12, 3))
+    colors = color_gradient([BLUE, GREEN, YELLOW, RED], len(class_vectors))
+
+    start = perf_counter()
+    regions = VoronoiRegions(class_vectors, colors, resolution=48)
+    build_time = perf_counter() - start
+    print(f"First build: {build_time*1e3:.1f} ms, {regions.n_rebuilt_pairs} boundaries, {regions.get_num_points()} vertices")
+
+    # Nudge one class vector: only the boundaries around it are rebuilt
+    moved = class_vectors.copy()
+    moved[0] += [0.3, -0.2, 0.1]
+    start = perf_counter()
+    regions.set_class_vectors(moved)
+    move_time = perf_counter() - start
+    print(f"One vector moved: {move_time*1e3:.1f} ms, {regions.n_rebuilt_pairs} of {len(regions.pair_meshes)} boundaries rebuilt")
+    full_labels = classify(regions.grid_centers, moved)[0]
+    assert np.array_equal(full_labels, regions.labels)
+
+    # Back to a layout seen before: straight from the cache
+    start = perf_counter()
+    regions.set_class_vectors(class_vectors)
+    cached_time = perf_counter() - start
+    print(f"Cached layout: {cached_time*1e3:.1f} ms")